@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import importlib
+import threading
+from collections.abc import MutableMapping
 from dataclasses import dataclass, field
+from functools import lru_cache
+from importlib.metadata import entry_points
 from pathlib import Path
-from typing import Any, Callable, Mapping
+from typing import Any, Callable, Iterator, Mapping
 
 from . import export as export_utils
 
@@ -36,30 +41,110 @@ class BuildContext:
         return self.model.get("params", {})
 
 
-def _ensure_registry():
-    from .models import (
-        opengrid_papierkorb,
-        opengrid_beam_papierkorb,
-        papierkorb,
-        solar_bus,
-    )
+Builder = Callable[[BuildContext], EngineResult]
+
+# Built-in builders are referenced as "<module>:<attr>" relative to this
+# package and only imported once a config actually asks for them.
+_BUILTIN_TARGETS: dict[str, str] = {
+    "papierkorb_tiles": ".models.papierkorb:build",
+    "solar_bus_roof": ".models.solar_bus:build",
+    "opengrid_2": ".models.opengrid_papierkorb:build",
+    "opengrid_papierkorb": ".models.opengrid_papierkorb:build",
+    "opengrid-beam_papierkorb": ".models.opengrid_beam_papierkorb:build",
+    "opengrid_beam_papierkorb": ".models.opengrid_beam_papierkorb:build",
+}
+
+
+def _resolve(target: str | Builder) -> Builder:
+    """Return the builder for a registry value (a callable or a target string)."""
+    if callable(target):
+        return target
+    return _import_target(target)
+
+
+@lru_cache(maxsize=None)
+def _import_target(target: str) -> Builder:
+    module_name, _, attr = target.partition(":")
+    module = importlib.import_module(module_name, package=__package__)
+    return getattr(module, attr)
+
+
+class _LazyRegistry(MutableMapping):
+    """Model name -> builder callable; target strings are imported on lookup.
+
+    Callers may still register plain callables (``MODEL_REGISTRY[name] = fn``).
+    """
+
+    def __init__(self, targets: Mapping[str, str | Builder]) -> None:
+        self._targets: dict[str, str | Builder] = dict(targets)
+
+    def __getitem__(self, name: str) -> Builder:
+        return _resolve(self._targets[name])
+
+    def __setitem__(self, name: str, builder: str | Builder) -> None:
+        self._targets[name] = builder
+
+    def __delitem__(self, name: str) -> None:
+        del self._targets[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._targets)
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def targets(self) -> dict[str, str | Builder]:
+        """Unresolved snapshot, for merging without importing every model."""
+        return dict(self._targets)
+
+
+MODEL_REGISTRY = _LazyRegistry(_BUILTIN_TARGETS)
+
+
+PLUGIN_GROUP = "oscadforge.models"
+
+# Entry-point plugins, merged under MODEL_REGISTRY on every lookup. Readers
+# use whatever snapshot is current; a background scan fills it in.
+_PLUGIN_CACHE: dict[str, str] | None = None
+_REGISTRY_LOCK = threading.Lock()
+_REFRESH_THREAD: threading.Thread | None = None
+
+
+def _discover_plugins() -> dict[str, str]:
+    try:
+        found = entry_points(group=PLUGIN_GROUP)
+    except Exception:  # broken dist metadata must not break the CLI
+        return {}
+    return {ep.name: ep.value for ep in found}
+
+
+def _refresh_registry() -> None:
+    global _PLUGIN_CACHE
+    plugins = _discover_plugins()
+    with _REGISTRY_LOCK:
+        _PLUGIN_CACHE = plugins
 
-    return {
-        "papierkorb_tiles": papierkorb.build,
-        "solar_bus_roof": solar_bus.build,
-        "opengrid_2": opengrid_papierkorb.build,
-        "opengrid_papierkorb": opengrid_papierkorb.build,
-        "opengrid-beam_papierkorb": opengrid_beam_papierkorb.build,
-        "opengrid_beam_papierkorb": opengrid_beam_papierkorb.build,
-    }
 
+def _registry(*, wait: bool = False) -> Mapping[str, str | Builder]:
+    global _REFRESH_THREAD
+    with _REGISTRY_LOCK:
+        thread = _REFRESH_THREAD
+        if thread is None:
+            thread = threading.Thread(target=_refresh_registry, name="oscadforge-registry", daemon=True)
+            _REFRESH_THREAD = thread
+            thread.start()
+    if wait:
+        thread.join()
+    return {**(_PLUGIN_CACHE or {}), **MODEL_REGISTRY.targets()}
 
-MODEL_REGISTRY = _ensure_registry()
 
+def available_models(*, wait: bool = False) -> list[str]:
+    """Return the sorted list of registered model names (built-ins plus plugins).
 
-def available_models() -> list[str]:
-    """Return the sorted list of registered model names."""
-    return sorted(MODEL_REGISTRY.keys())
+    Answers from the current snapshot; pass ``wait=True`` to block until the
+    plugin scan has finished.
+    """
+    return sorted(_registry(wait=wait))
 
 
 def build_model(config: Mapping[str, Any]) -> EngineResult:
@@ -70,8 +155,12 @@ def build_model(config: Mapping[str, Any]) -> EngineResult:
     if not model_name:
         raise ValueError("config.model.name must be provided")
 
-    if model_name not in MODEL_REGISTRY:
-        raise ValueError(f"Unknown model '{model_name}'. Available: {', '.join(MODEL_REGISTRY)}")
+    registry = _registry()
+    if model_name not in registry:
+        # Plugin discovery may still be running; only a finished scan is authoritative.
+        registry = _registry(wait=True)
+    if model_name not in registry:
+        raise ValueError(f"Unknown model '{model_name}'. Available: {', '.join(registry)}")
 
     export_cfg = config.get("export", {})
     if not isinstance(export_cfg, Mapping):
@@ -89,7 +178,7 @@ def build_model(config: Mapping[str, Any]) -> EngineResult:
         openscad_bin=export_cfg.get("openscad_bin"),
         freecad_bin=export_cfg.get("freecad_bin"),
     )
-    builder: Callable[[BuildContext], EngineResult] = MODEL_REGISTRY[model_name]
+    builder = _resolve(registry[model_name])
     result = builder(context)
     result.metadata.setdefault("model_name", model_name)
     result.metadata.setdefault("output_dir", str(out_dir))
@@ -1,15 +1,24 @@
 from __future__ import annotations
 
 import hashlib
+import importlib
 import json
+import mmap
 import os
+import queue
+import re
 import shutil
 import subprocess
 import tempfile
 import textwrap
+import threading
+import time
 import concurrent.futures
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, Iterable, Mapping, Optional, Sequence
 
 
@@ -27,31 +36,99 @@ def run_openscad(
     output_path: Path,
     openscad_bin: Optional[str],
     extra_args: Optional[Sequence[str]] = None,
+    *,
+    quiet: bool = False,
+    cache: RenderCache | None = None,
 ) -> None:
     if not openscad_bin:
         raise ExportError("openscad binary not configured; set export.openscad_bin")
+    cache_key = None
+    if cache is not None and cache.enabled:
+        cache_key = cache.key_for(scad_path, output_path, openscad_bin, extra_args)
+        if cache.restore(cache_key, output_path):
+            return
     cmd = [openscad_bin, "-o", str(output_path)]
+    if quiet and _openscad_supports(openscad_bin, "--quiet"):
+        cmd.append("--quiet")
     if extra_args:
         cmd.extend(extra_args)
     cmd.append(str(scad_path))
-    env = os.environ.copy()
-    env.setdefault("APPIMAGE_EXTRACT_AND_RUN", "1")
-    repo_root = Path.cwd()
-    third_party = repo_root / "third_party"
-    if third_party.exists():
-        existing = env.get("OPENSCADPATH")
-        path_str = str(third_party)
-        if existing:
-            path_str = f"{path_str}:{existing}"
-        env["OPENSCADPATH"] = path_str
+    env = _tool_env("openscad")
+    # OpenSCAD can print megabytes of warnings; spool them to an anonymous
+    # file and only read the tail back when the run fails.
+    with tempfile.TemporaryFile() as log:
+        try:
+            subprocess.run(cmd, check=True, stdout=log, stderr=subprocess.STDOUT, env=env)
+        except FileNotFoundError as exc:
+            raise ExportError(f"OpenSCAD binary not found: {openscad_bin}") from exc
+        except subprocess.CalledProcessError as exc:
+            raise ExportError(
+                f"OpenSCAD failed with code {exc.returncode}: {_log_tail(log)}"
+            ) from exc
+    if cache_key is not None:
+        cache.store(cache_key, output_path)
+
+
+@lru_cache(maxsize=None)
+def _openscad_supports(openscad_bin: str, flag: str) -> bool:
+    """Feature-detect a CLI flag once per binary from ``openscad --help``."""
     try:
-        subprocess.run(cmd, check=True, capture_output=True, text=True, env=env)
-    except FileNotFoundError as exc:
-        raise ExportError(f"OpenSCAD binary not found: {openscad_bin}") from exc
-    except subprocess.CalledProcessError as exc:
-        raise ExportError(
-            f"OpenSCAD failed with code {exc.returncode}: {exc.stderr}"
-        ) from exc
+        proc = subprocess.run(
+            [openscad_bin, "--help"],
+            capture_output=True,
+            text=True,
+            timeout=30,
+            env=_tool_env("openscad"),
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return flag in f"{proc.stdout}\n{proc.stderr}"
+
+
+def _log_tail(log: Any, limit: int = 4096) -> str:
+    size = log.seek(0, os.SEEK_END)
+    log.seek(max(0, size - limit))
+    return log.read().decode("utf-8", errors="replace")
+
+
+def _tool_env(tool: str) -> dict[str, str]:
+    """Return the (shared, read-only) environment for ``tool`` subprocesses.
+
+    ``tool`` is ``openscad``, ``freecad`` or ``freecad_openscad`` (FreeCAD
+    with the OpenSCAD importer module path). Built once per working directory;
+    each caller gets its own copy.
+    """
+    return dict(_build_tool_env(os.getcwd(), tool))
+
+
+@lru_cache(maxsize=8)
+def _build_tool_env(cwd: str, tool: str) -> Mapping[str, str]:
+    env = os.environ.copy()
+    repo_root = Path(cwd)
+    if tool == "openscad":
+        env.setdefault("APPIMAGE_EXTRACT_AND_RUN", "1")
+        third_party = repo_root / "third_party"
+        if third_party.exists():
+            existing = env.get("OPENSCADPATH")
+            path_str = str(third_party)
+            if existing:
+                path_str = f"{path_str}:{existing}"
+            env["OPENSCADPATH"] = path_str
+        return MappingProxyType(env)
+    # Keep FreeCAD's config/cache inside the workspace so sandboxed runs do
+    # not fail when $HOME is read-only. Plain conversions and assemblies honour
+    # a user-provided FREECAD_USER_HOME; the OpenSCAD importer needs the
+    # workspace home (see _apply_openscad_mod_path).
+    freecad_user_home = repo_root / "tooling" / "freecad_home"
+    freecad_user_home.mkdir(parents=True, exist_ok=True)
+    if tool == "freecad_openscad":
+        env["FREECAD_USER_HOME"] = str(freecad_user_home)
+    else:
+        env.setdefault("FREECAD_USER_HOME", str(freecad_user_home))
+    env["PYTHONNOUSERSITE"] = "1"
+    if tool == "freecad_openscad":
+        _apply_openscad_mod_path(env, freecad_user_home)
+    return MappingProxyType(env)
 
 
 @dataclass
@@ -71,6 +148,12 @@ class StepExportTask:
     freecad_bin: Optional[str]
     stl_path: Path | None = None
     metadata: Mapping[str, Any] | None = None
+    # Concrete backend when already resolved (see _preflight_step_backends).
+    resolved_backend: str | None = None
+    # Caller-supplied dedup index key standing in for the SCAD content hash,
+    # so a cached STEP can be found before the SCAD is written (see
+    # lookup_cached_step).
+    source_key: str | None = None
 
 
 @dataclass
@@ -79,6 +162,40 @@ class StepAssemblyPart:
     matrix: Sequence[Sequence[float]]
 
 
+@dataclass
+class FreecadJob:
+    """One FreeCAD conversion (CSG tree or STL mesh -> STEP solid)."""
+
+    kind: str  # 'csg' or 'stl'
+    source: Path
+    step_path: Path
+    tolerance: float = 0.1
+    # Seconds a daemon may spend on this job before it is killed (None: no limit).
+    timeout: float | None = None
+
+
+@dataclass
+class _PreparedStepExport:
+    task: StepExportTask
+    backend: str
+    allow_stl_fallback: bool
+    dedup: StepDedupManager
+    conversion_target: Path
+    stl_path: Path | None = None
+    csg_path: Path | None = None
+    dedup_hash: str | None = None
+    source_key: str | None = None
+    cache_step_path: Path | None = None
+    freecad_job: FreecadJob | None = None
+    result: StepExportResult | None = None
+    temp_paths: list[Path] = field(default_factory=list)
+
+    def cleanup(self) -> None:
+        for path in self.temp_paths:
+            path.unlink(missing_ok=True)
+        self.temp_paths.clear()
+
+
 def export_step_artifact(
     scad_path: Path,
     step_path: Path,
@@ -87,117 +204,265 @@ def export_step_artifact(
     openscad_bin: Optional[str],
     freecad_bin: Optional[str],
     stl_path: Path | None = None,
+    dedup: StepDedupManager | None = None,
 ) -> StepExportResult:
-    scad_path = scad_path.resolve()
-    step_path = step_path.resolve()
+    task = StepExportTask(
+        scad_path=scad_path,
+        step_path=step_path,
+        export_cfg=export_cfg,
+        openscad_bin=openscad_bin,
+        freecad_bin=freecad_bin,
+        stl_path=stl_path,
+    )
+    prepared = _prepare_step_export(task, dedup)
+    try:
+        if prepared.result is None:
+            job = prepared.freecad_job
+            assert job is not None and freecad_bin
+            try:
+                _convert_with_freecad(job, freecad_bin)
+            except ExportError:
+                if job.kind != "csg" or not prepared.allow_stl_fallback:
+                    raise
+                _convert_with_freecad(_stl_fallback_job(prepared), freecad_bin)
+            prepared.result = _finish_step_export(prepared)
+        _record_dedup_source(prepared)
+        return prepared.result
+    finally:
+        prepared.cleanup()
+        prepared.dedup.save_source_index()
+
+
+def _prepare_step_export(
+    task: StepExportTask,
+    dedup: StepDedupManager | None = None,
+) -> _PreparedStepExport:
+    """Run every OpenSCAD-side step of a STEP export.
+
+    Dedup hits and the pure OpenSCAD backend finish here (``result`` is set);
+    FreeCAD backends stop short of the conversion and leave a ``freecad_job``
+    so callers can run several of them inside one FreeCAD process.
+    """
+    scad_path = task.scad_path.resolve()
+    step_path = task.step_path.resolve()
+    export_cfg = task.export_cfg
     backend_requested = str(export_cfg.get("step_backend", "openscad") or "openscad").lower()
-    backend = _resolve_step_backend(backend_requested, scad_path, stl_path)
-    allow_stl_fallback = backend_requested in {"freecad_auto", "auto"}
-    dedup = StepDedupManager.from_config(
-        export_cfg.get("step_dedup"),
-        default_cache_dir=step_path.parent / ".step_cache",
+    backend = task.resolved_backend or _resolve_step_backend(
+        backend_requested, scad_path, task.stl_path
+    )
+    if dedup is None:
+        dedup = StepDedupManager.from_config(
+            export_cfg.get("step_dedup"),
+            default_cache_dir=default_step_cache_dir(backend),
+        )
+    prepared = _PreparedStepExport(
+        task=StepExportTask(
+            scad_path=scad_path,
+            step_path=step_path,
+            export_cfg=export_cfg,
+            openscad_bin=task.openscad_bin,
+            freecad_bin=task.freecad_bin,
+            stl_path=task.stl_path,
+            metadata=task.metadata,
+            resolved_backend=backend,
+            source_key=task.source_key,
+        ),
+        backend=backend,
+        allow_stl_fallback=backend_requested in {"freecad_auto", "auto"},
+        dedup=dedup,
+        conversion_target=step_path,
+        stl_path=task.stl_path,
     )
-
-    csg_path: Path | None = None
-    csg_generated = False
-
-    def ensure_csg() -> Path:
-        nonlocal csg_path, csg_generated
-        if csg_path is None:
-            csg_path = step_path.with_suffix(".step_source.csg")
-            run_openscad(
-                scad_path,
-                csg_path,
-                openscad_bin,
-                ["--export-format", "csg"],
-            )
-            if not csg_path.exists():
-                raise ExportError(
-                    f"OpenSCAD did not produce CSG output at {csg_path}; "
-                    "check the OpenSCAD logs (imports and surface primitives cannot be exported as CSG)."
-                )
-            csg_generated = True
-        return csg_path
-
-    conversion_target = step_path
-    dedup_hash: str | None = None
-    cache_step_path: Path | None = None
-
     try:
         if dedup.enabled:
-            csg_for_hash = ensure_csg()
-            dedup_hash = dedup.hash_csg(csg_for_hash)
-            cache_step_path = dedup.cache_path_for_hash(dedup_hash)
-            if cache_step_path.exists():
-                dedup.link_to_output(cache_step_path, step_path)
-                return StepExportResult(
-                    step_path=step_path,
-                    cache_path=cache_step_path,
-                    dedup_hit=True,
-                    dedup_hash=dedup_hash,
-                )
-            conversion_target = cache_step_path
+            prepared.source_key = _toolchain_source_key(
+                task.source_key or dedup.source_key(scad_path), prepared.task
+            )
+            known_hash = dedup.lookup_source(prepared.source_key)
+            if known_hash and _link_cached_step(prepared, known_hash):
+                return prepared
+            csg_for_hash = _ensure_csg(prepared)
+            digest = dedup.hash_csg(csg_for_hash)
+            if _link_cached_step(prepared, digest):
+                return prepared
+            prepared.conversion_target = prepared.cache_step_path
 
         if backend == "openscad":
+            # The dedup hash already paid for a CSG compile; feeding the
+            # flattened tree back in skips re-evaluating the SCAD source.
+            # Only when it sits next to the .scad so relative imports resolve.
+            source = scad_path
+            if prepared.csg_path is not None and prepared.csg_path.parent == scad_path.parent:
+                source = prepared.csg_path
             run_openscad(
-                scad_path,
-                conversion_target,
-                openscad_bin,
-                ["--export-format", "step"],
+                source,
+                prepared.conversion_target,
+                task.openscad_bin,
+                ["--export-format", "step", *openscad_backend_args(export_cfg, task.openscad_bin)],
             )
+            prepared.result = _finish_step_export(prepared)
         elif backend in {"freecad", "freecad_stl"}:
-            if not freecad_bin:
+            if not task.freecad_bin:
                 raise ExportError("freecad binary not configured; set export.freecad_bin")
-            tolerance = float(export_cfg.get("freecad_mesh_tolerance", 0.1))
-            temp_stl: Path | None = None
-            if stl_path is None:
-                temp_stl = step_path.with_suffix(".step_source.stl")
-                run_openscad(scad_path, temp_stl, openscad_bin)
-                stl_path = temp_stl
-            try:
-                convert_stl_to_step_with_freecad(
-                    stl_path, conversion_target, freecad_bin, tolerance
-                )
-            finally:
-                if temp_stl:
-                    temp_stl.unlink(missing_ok=True)
+            prepared.freecad_job = FreecadJob(
+                kind="stl",
+                source=_ensure_stl(prepared),
+                step_path=prepared.conversion_target,
+                tolerance=_mesh_tolerance(export_cfg),
+                timeout=_freecad_timeout(export_cfg),
+            )
         elif backend in {"freecad_csg", "freecad-csg"}:
-            if not freecad_bin:
+            if not task.freecad_bin:
                 raise ExportError("freecad binary not configured; set export.freecad_bin")
-            csg_input = ensure_csg()
-            try:
-                convert_csg_to_step_with_freecad(csg_input, conversion_target, freecad_bin)
-            except ExportError:
-                if not allow_stl_fallback:
-                    raise
-                tolerance = float(export_cfg.get("freecad_mesh_tolerance", 0.1))
-                temp_stl: Path | None = None
-                try:
-                    if stl_path is None:
-                        temp_stl = step_path.with_suffix(".step_source.stl")
-                        run_openscad(scad_path, temp_stl, openscad_bin)
-                        stl_path = temp_stl
-                    convert_stl_to_step_with_freecad(
-                        stl_path, conversion_target, freecad_bin, tolerance
-                    )
-                finally:
-                    if temp_stl:
-                        temp_stl.unlink(missing_ok=True)
+            prepared.freecad_job = FreecadJob(
+                kind="csg",
+                source=_ensure_csg(prepared),
+                step_path=prepared.conversion_target,
+                timeout=_freecad_timeout(export_cfg),
+            )
         else:
             raise ExportError(f"unsupported STEP backend '{backend}'")
-
-        if dedup.enabled:
-            dedup.link_to_output(cache_step_path, step_path)
-            return StepExportResult(
-                step_path=step_path,
-                cache_path=cache_step_path,
-                dedup_hit=False,
-                dedup_hash=dedup_hash,
+    except BaseException:
+        prepared.cleanup()
+        raise
+    return prepared
+
+
+def _link_cached_step(prepared: _PreparedStepExport, digest: str) -> bool:
+    """Point the task at cache entry ``digest``; link and finish it if present."""
+    dedup = prepared.dedup
+    prepared.dedup_hash = digest
+    prepared.cache_step_path = dedup.cache_path_for_hash(digest)
+    if not dedup.is_cached(prepared.cache_step_path):
+        return False
+    try:
+        dedup.link_to_output(prepared.cache_step_path, prepared.task.step_path)
+    except ExportError:
+        # Cache entry vanished since we last saw it; rebuild it.
+        dedup.forget(prepared.cache_step_path)
+        return False
+    prepared.result = StepExportResult(
+        step_path=prepared.task.step_path,
+        cache_path=prepared.cache_step_path,
+        dedup_hit=True,
+        dedup_hash=digest,
+    )
+    return True
+
+
+def _ensure_csg(prepared: _PreparedStepExport) -> Path:
+    if prepared.csg_path is None:
+        csg_path = prepared.task.step_path.with_suffix(".step_source.csg")
+        run_openscad(
+            prepared.task.scad_path,
+            csg_path,
+            prepared.task.openscad_bin,
+            ["--export-format", "csg"],
+            quiet=True,
+        )
+        if not csg_path.exists():
+            raise ExportError(
+                f"OpenSCAD did not produce CSG output at {csg_path}; "
+                "check the OpenSCAD logs (imports and surface primitives cannot be exported as CSG)."
             )
-        return StepExportResult(step_path=step_path)
-    finally:
-        if csg_generated and csg_path:
-            csg_path.unlink(missing_ok=True)
+        prepared.csg_path = csg_path
+        prepared.temp_paths.append(csg_path)
+    return prepared.csg_path
+
+
+def _ensure_stl(prepared: _PreparedStepExport) -> Path:
+    if prepared.stl_path is None:
+        temp_stl = prepared.task.step_path.with_suffix(".step_source.stl")
+        prepared.temp_paths.append(temp_stl)
+        run_openscad(
+            prepared.task.scad_path,
+            temp_stl,
+            prepared.task.openscad_bin,
+            openscad_backend_args(prepared.task.export_cfg, prepared.task.openscad_bin),
+        )
+        prepared.stl_path = temp_stl
+    return prepared.stl_path
+
+
+def _stl_fallback_job(prepared: _PreparedStepExport) -> FreecadJob:
+    """STL conversion used when FreeCAD rejects the CSG tree (freecad_auto)."""
+    return FreecadJob(
+        kind="stl",
+        source=_ensure_stl(prepared),
+        step_path=prepared.conversion_target,
+        tolerance=_mesh_tolerance(prepared.task.export_cfg),
+        timeout=_freecad_timeout(prepared.task.export_cfg),
+    )
+
+
+def _mesh_tolerance(export_cfg: Mapping[str, Any]) -> float:
+    return float(export_cfg.get("freecad_mesh_tolerance", 0.1))
+
+
+def _freecad_timeout(export_cfg: Mapping[str, Any]) -> float | None:
+    """Per-job FreeCAD deadline in seconds (``export.freecad_timeout``; 0 disables)."""
+    value = export_cfg.get("freecad_timeout", 600)
+    return float(value) if value else None
+
+
+def _convert_with_freecad(job: FreecadJob, freecad_bin: str) -> None:
+    if job.kind == "csg":
+        convert_csg_to_step_with_freecad(job.source, job.step_path, freecad_bin)
+    else:
+        convert_stl_to_step_with_freecad(job.source, job.step_path, freecad_bin, job.tolerance)
+
+
+def _finish_step_export(prepared: _PreparedStepExport) -> StepExportResult:
+    step_path = prepared.task.step_path
+    if prepared.dedup.enabled:
+        prepared.dedup.write_metadata(
+            prepared.cache_step_path,
+            scad_path=prepared.task.scad_path,
+            backend=prepared.backend,
+        )
+        prepared.dedup.link_to_output(prepared.cache_step_path, step_path)
+        return StepExportResult(
+            step_path=step_path,
+            cache_path=prepared.cache_step_path,
+            dedup_hit=False,
+            dedup_hash=prepared.dedup_hash,
+        )
+    return StepExportResult(step_path=step_path)
+
+
+def _record_dedup_source(prepared: _PreparedStepExport) -> None:
+    """Index a finished export's source key -> CSG hash in this process.
+
+    With ``step_executor: process`` the preparation runs in a worker whose
+    copy of the index is discarded, so callers record once the prepared
+    export is back in the parent.
+    """
+    if not prepared.dedup.enabled or prepared.cache_step_path is None or prepared.result is None:
+        return
+    _KNOWN_CACHE_ENTRIES.add(str(prepared.cache_step_path))
+    prepared.dedup.record_source(prepared.source_key, prepared.dedup_hash)
+
+
+def _preflight_step_backends(tasks: Sequence[StepExportTask]) -> list[StepExportTask]:
+    """Resolve every task's backend up front, scanning each SCAD file once."""
+    imports_stl: dict[Path, bool] = {}
+    resolved: list[StepExportTask] = []
+    for task in tasks:
+        requested = str(task.export_cfg.get("step_backend", "openscad") or "openscad").lower()
+        if task.resolved_backend:
+            resolved.append(task)
+            continue
+        if requested not in {"freecad_auto", "auto"}:
+            resolved.append(replace(task, resolved_backend=requested))
+            continue
+        if task.scad_path not in imports_stl:
+            imports_stl[task.scad_path] = _scad_imports_stl(task.scad_path)
+        if imports_stl[task.scad_path] or (task.stl_path and task.stl_path.exists()):
+            backend = "freecad"
+        else:
+            backend = "freecad_csg"
+        resolved.append(replace(task, resolved_backend=backend))
+    return resolved
 
 
 def _resolve_step_backend(backend: str, scad_path: Path, stl_path: Path | None) -> str:
@@ -208,70 +473,236 @@ def _resolve_step_backend(backend: str, scad_path: Path, stl_path: Path | None)
     return backend
 
 
+_STL_IMPORT_RE = re.compile(rb"import\s*\([^)\n]*\.stl", re.IGNORECASE)
+
+
 def _scad_imports_stl(scad_path: Path) -> bool:
     try:
-        text = scad_path.read_text(encoding="utf-8", errors="ignore")
+        data = scad_path.read_bytes()
     except OSError:
         return False
-    lowered = text.lower()
-    if "import(" not in lowered:
-        return False
-    for line in lowered.splitlines():
-        if "import(" in line and ".stl" in line:
-            return True
-    return False
+    return _STL_IMPORT_RE.search(data) is not None
 
 
-def convert_stl_to_step_with_freecad(
-    stl_path: Path,
-    step_path: Path,
-    freecad_bin: str,
-    tolerance: float,
-) -> None:
-    """Invoke FreeCAD CLI to convert STL mesh into a STEP solid."""
-    script = textwrap.dedent(
-        """
-        import Mesh
-        import Part
-        import sys
-        import os
+_FREECAD_STL_SCRIPT = textwrap.dedent(
+    """
+    import Mesh
+    import Part
+    import sys
+    import os
 
-        extra_mod = os.environ.get("OSC_FORGE_OPENSCAD_MOD")
-        if extra_mod and extra_mod not in sys.path:
-            sys.path.insert(0, extra_mod)
+    extra_mod = os.environ.get("OSC_FORGE_OPENSCAD_MOD")
+    if extra_mod and extra_mod not in sys.path:
+        sys.path.insert(0, extra_mod)
 
-        if len(sys.argv) < 5:
-            raise SystemExit("usage: freecadcmd script.py mesh.stl out.step tolerance")
+    if len(sys.argv) < 5:
+        raise SystemExit("usage: freecadcmd script.py mesh.stl out.step tolerance")
 
-        stl_path = sys.argv[2]
-        step_path = sys.argv[3]
-        tol = float(sys.argv[4])
+    stl_path = sys.argv[2]
+    step_path = sys.argv[3]
+    tol = float(sys.argv[4])
 
-        mesh = Mesh.Mesh(stl_path)
+    mesh = Mesh.Mesh(stl_path)
+    shape = Part.Shape()
+    shape.makeShapeFromMesh(mesh.Topology, tol)
+    shell = Part.makeShell(shape.Faces)
+    solid = Part.makeSolid(shell)
+    try:
+        solid = solid.removeSplitter()
+    except Exception:
+        pass
+    solid.exportStep(step_path)
+    """
+).strip()
+
+
+_FREECAD_CSG_SCRIPT = textwrap.dedent(
+    """
+    import sys
+    import os
+    extra_mod = os.environ.get("OSC_FORGE_OPENSCAD_MOD")
+    if extra_mod and extra_mod not in sys.path:
+        sys.path.insert(0, extra_mod)
+    import Part
+    import importCSG
+    import FreeCAD as App
+
+    if len(sys.argv) < 4:
+        raise SystemExit("usage: freecadcmd script.py mesh.csg out.step")
+
+    csg_path = sys.argv[2]
+    step_path = sys.argv[3]
+
+    doc = App.newDocument("oscadforge_csg")
+    importCSG.insert(csg_path, doc.Name)
+    doc.recompute()
+    objs = [obj for obj in doc.Objects if hasattr(obj, "Shape")]
+    if not objs:
+        raise SystemExit("no shapes produced from CSG input")
+    Part.export(objs, step_path)
+    """
+).strip()
+
+
+# Replies are tagged so they can be told apart from FreeCAD's own console output.
+_DAEMON_REPLY_PREFIX = "@@oscadforge "
+
+_FREECAD_DAEMON_SCRIPT = textwrap.dedent(
+    """
+    import json
+    import os
+    import sys
+    extra_mod = os.environ.get("OSC_FORGE_OPENSCAD_MOD")
+    if extra_mod and extra_mod not in sys.path:
+        sys.path.insert(0, extra_mod)
+    import FreeCAD as App
+    import Mesh
+    import Part
+
+    REPLY_PREFIX = "@@oscadforge "
+
+    def convert_csg(job):
+        import importCSG
+        doc = App.newDocument("oscadforge_csg")
+        try:
+            importCSG.insert(job["source"], doc.Name)
+            doc.recompute()
+            objs = [obj for obj in doc.Objects if hasattr(obj, "Shape")]
+            if not objs:
+                raise RuntimeError("no shapes produced from CSG input")
+            Part.export(objs, job["step"])
+        finally:
+            App.closeDocument(doc.Name)
+
+    def convert_stl(job):
+        mesh = Mesh.Mesh(job["source"])
         shape = Part.Shape()
-        shape.makeShapeFromMesh(mesh.Topology, tol)
-        shell = Part.makeShell(shape.Faces)
-        solid = Part.makeSolid(shell)
+        shape.makeShapeFromMesh(mesh.Topology, float(job["tolerance"]))
+        solid = Part.makeSolid(Part.makeShell(shape.Faces))
         try:
             solid = solid.removeSplitter()
         except Exception:
             pass
-        solid.exportStep(step_path)
-        """
-    ).strip()
+        solid.exportStep(job["step"])
 
-    with tempfile.NamedTemporaryFile(
-        mode="w", suffix=".py", delete=False, encoding="utf-8"
-    ) as handle:
-        handle.write(script)
-        script_path = Path(handle.name)
+    # One JSON job per stdin line, one tagged JSON reply per job on stdout.
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+            if job["kind"] == "csg":
+                convert_csg(job)
+            else:
+                convert_stl(job)
+        except Exception as exc:
+            reply = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        else:
+            reply = {"ok": True}
+        sys.stdout.write(REPLY_PREFIX + json.dumps(reply) + "\\n")
+        sys.stdout.flush()
+    """
+).strip()
 
-    env = os.environ.copy()
-    repo_root = Path.cwd()
-    freecad_user_home = repo_root / "tooling" / "freecad_home"
-    freecad_user_home.mkdir(parents=True, exist_ok=True)
-    env.setdefault("FREECAD_USER_HOME", str(freecad_user_home))
-    env["PYTHONNOUSERSITE"] = "1"
+
+_FREECAD_ASSEMBLY_SCRIPT = textwrap.dedent(
+    """
+    import json
+    import Part
+    import FreeCAD as App
+    import sys
+
+    if len(sys.argv) < 4:
+        raise SystemExit("usage: freecadcmd script.py assembly.json out.step")
+
+    data_path = sys.argv[2]
+    step_path = sys.argv[3]
+
+    with open(data_path, "r", encoding="utf-8") as handle:
+        entries = json.load(handle)
+
+    doc = App.newDocument("oscadforge_assembly")
+    objects = []
+    for idx, entry in enumerate(entries):
+        shape = Part.Shape()
+        shape.read(entry["step"])
+        obj = doc.addObject("Part::Feature", f"Panel_{idx}")
+        if entry.get("mirror"):
+            # Reflected frames arrive split into a local z mirror plus a
+            # proper rotation; a Placement cannot carry the reflection.
+            shape = shape.mirror(App.Vector(0, 0, 0), App.Vector(0, 0, 1))
+        obj.Shape = shape
+        # Row-major 4x4, flattened and validated by the caller.
+        obj.Placement = App.Placement(App.Matrix(*entry["matrix"]))
+        objects.append(obj)
+
+    doc.recompute()
+    if not objects:
+        raise SystemExit("no objects created for assembly")
+    Part.export(objects, step_path)
+    """
+).strip()
+
+
+@lru_cache(maxsize=1)
+def _freecad_script_dir() -> Path:
+    """Return a private (0700, owned by us) directory for FreeCAD scripts."""
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    # The temp dir is per-user on Windows already; elsewhere key it on the uid.
+    user_tag = os.getuid() if hasattr(os, "getuid") else "user"
+    candidates = [
+        Path(base).expanduser() / "oscadforge" / "freecad_scripts",
+        Path(tempfile.gettempdir()) / f"oscadforge-{user_tag}" / "freecad_scripts",
+    ]
+    for candidate in candidates:
+        try:
+            candidate.mkdir(mode=0o700, parents=True, exist_ok=True)
+            if hasattr(os, "getuid") and candidate.stat().st_uid != os.getuid():
+                continue
+            os.chmod(candidate, 0o700)
+        except OSError:
+            continue
+        return candidate
+    return Path(tempfile.mkdtemp(prefix="oscadforge-freecad-"))
+
+
+def _freecad_script_path(script: str) -> Path:
+    """Return a persistent file holding ``script``, keyed by its content hash.
+
+    An existing file is only reused when it still holds exactly ``script``;
+    concurrent writers each stage their own temp file before the rename.
+    """
+    data = script.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    script_dir = _freecad_script_dir()
+    script_path = script_dir / f"{digest}.py"
+    try:
+        if script_path.read_bytes() == data:
+            return script_path
+    except OSError:
+        pass
+    fd, tmp_name = tempfile.mkstemp(dir=script_dir, prefix=f"{digest}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_name, script_path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return script_path
+
+
+def convert_stl_to_step_with_freecad(
+    stl_path: Path,
+    step_path: Path,
+    freecad_bin: str,
+    tolerance: float,
+) -> None:
+    """Invoke FreeCAD CLI to convert STL mesh into a STEP solid."""
+    script_path = _freecad_script_path(_FREECAD_STL_SCRIPT)
+
+    env = _tool_env("freecad")
 
     proc = None
     try:
@@ -292,11 +723,6 @@ def convert_stl_to_step_with_freecad(
         raise ExportError(
             f"FreeCAD STEP conversion failed ({exc.returncode}): {stderr}"
         ) from exc
-    finally:
-        try:
-            os.remove(script_path)
-        except FileNotFoundError:
-            pass
     if proc and not step_path.exists():
         stdout = (proc.stdout or "").strip()
         stderr = (proc.stderr or "").strip()
@@ -312,61 +738,9 @@ def convert_csg_to_step_with_freecad(
     freecad_bin: str,
 ) -> None:
     """Invoke FreeCAD CLI to convert a CSG tree into a STEP solid."""
-    script = textwrap.dedent(
-        """
-        import sys
-        import os
-        extra_mod = os.environ.get("OSC_FORGE_OPENSCAD_MOD")
-        if extra_mod and extra_mod not in sys.path:
-            sys.path.insert(0, extra_mod)
-        import Part
-        import importCSG
-        import FreeCAD as App
+    script_path = _freecad_script_path(_FREECAD_CSG_SCRIPT)
 
-        if len(sys.argv) < 4:
-            raise SystemExit("usage: freecadcmd script.py mesh.csg out.step")
-
-        csg_path = sys.argv[2]
-        step_path = sys.argv[3]
-
-        doc = App.newDocument("oscadforge_csg")
-        importCSG.insert(csg_path, doc.Name)
-        doc.recompute()
-        objs = [obj for obj in doc.Objects if hasattr(obj, "Shape")]
-        if not objs:
-            raise SystemExit("no shapes produced from CSG input")
-        Part.export(objs, step_path)
-        """
-    ).strip()
-
-    with tempfile.NamedTemporaryFile(
-        mode="w", suffix=".py", delete=False, encoding="utf-8"
-    ) as handle:
-        handle.write(script)
-        script_path = Path(handle.name)
-
-    env = os.environ.copy()
-    # Force FreeCAD to keep its config/cache inside the workspace so sandboxed
-    # runs do not fail when $HOME is read-only.
-    repo_root = Path.cwd()
-    freecad_user_home = repo_root / "tooling" / "freecad_home"
-    freecad_user_home.mkdir(parents=True, exist_ok=True)
-    env["FREECAD_USER_HOME"] = str(freecad_user_home)
-    env["PYTHONNOUSERSITE"] = "1"
-
-    user_mod = Path.home() / ".local" / "freecad_mods" / "Mod"
-    if not user_mod.exists():
-        repo_mod = freecad_user_home / "freecad_mods" / "Mod"
-        user_mod = repo_mod if repo_mod.exists() else None
-
-    if user_mod and user_mod.exists():
-        openscad_mod = user_mod / "OpenSCAD"
-        target_mod = openscad_mod if openscad_mod.exists() else user_mod
-        existing = env.get("PYTHONPATH")
-        env["PYTHONPATH"] = (
-            f"{target_mod}{os.pathsep}{existing}" if existing else str(target_mod)
-        )
-        env["OSC_FORGE_OPENSCAD_MOD"] = str(target_mod)
+    env = _tool_env("freecad_openscad")
     proc = None
     try:
         cmd = [
@@ -385,11 +759,6 @@ def convert_csg_to_step_with_freecad(
         raise ExportError(
             f"FreeCAD STEP conversion failed ({exc.returncode}): {stderr}"
         ) from exc
-    finally:
-        try:
-            os.remove(script_path)
-        except FileNotFoundError:
-            pass
     if proc and not step_path.exists():
         stdout = (proc.stdout or "").strip()
         stderr = (proc.stderr or "").strip()
@@ -399,117 +768,603 @@ def convert_csg_to_step_with_freecad(
         )
 
 
+class FreeCADDaemon:
+    """Long-lived FreeCAD process that converts CSG/STL jobs sent over stdin.
+
+    Importing FreeCAD, Part and the OpenSCAD importer dominates short
+    conversions, so one process serves many jobs::
+
+        with FreeCADDaemon(freecad_bin) as daemon:
+            error = daemon.convert(job)
+    """
+
+    def __init__(self, freecad_bin: str) -> None:
+        self.freecad_bin = freecad_bin
+        self._proc: subprocess.Popen[str] | None = None
+        self._log: Any = None
+        # Filled by a reader thread so convert() can wait with a deadline;
+        # None marks the end of stdout.
+        self._lines: queue.SimpleQueue[str | None] = queue.SimpleQueue()
+
+    def __enter__(self) -> FreeCADDaemon:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self) -> None:
+        script_path = _freecad_script_path(_FREECAD_DAEMON_SCRIPT)
+        # stderr goes to a file so a chatty FreeCAD can never fill a pipe.
+        self._log = tempfile.TemporaryFile()
+        try:
+            self._proc = subprocess.Popen(
+                [self.freecad_bin, str(script_path)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=self._log,
+                text=True,
+                bufsize=1,
+                env=_tool_env("freecad_openscad"),
+            )
+        except FileNotFoundError as exc:
+            self._log.close()
+            self._log = None
+            raise ExportError(f"FreeCAD binary not found: {self.freecad_bin}") from exc
+        self._lines = queue.SimpleQueue()
+        threading.Thread(
+            target=_pump_lines,
+            args=(self._proc.stdout, self._lines),
+            name="oscadforge-freecad-stdout",
+            daemon=True,
+        ).start()
+
+    def convert(self, job: FreecadJob) -> str | None:
+        """Convert one job; return ``None`` on success or the error text.
+
+        Raises ``ExportError`` when the FreeCAD process itself died or missed
+        ``job.timeout``; a timed-out process is killed, so the caller restarts
+        it for the next job.
+        """
+        if not self.alive:
+            raise ExportError("FreeCAD daemon is not running")
+        assert self._proc is not None and self._proc.stdin and self._proc.stdout
+        request = {
+            "kind": job.kind,
+            "source": str(job.source),
+            "step": str(job.step_path),
+            "tolerance": job.tolerance,
+        }
+        deadline = None if job.timeout is None else time.monotonic() + job.timeout
+        try:
+            self._proc.stdin.write(json.dumps(request) + "\n")
+            self._proc.stdin.flush()
+            while True:
+                try:
+                    line = self._lines.get(
+                        timeout=None if deadline is None else max(0.0, deadline - time.monotonic())
+                    )
+                except queue.Empty:
+                    self._proc.kill()
+                    self._proc.wait()
+                    raise ExportError(
+                        f"FreeCAD timed out after {job.timeout:g}s converting {job.source}"
+                    ) from None
+                if line is None:
+                    raise ExportError(
+                        f"FreeCAD exited ({self._proc.wait()}) while converting {job.source}: "
+                        f"{_log_tail(self._log)}"
+                    )
+                if line.startswith(_DAEMON_REPLY_PREFIX):
+                    reply = json.loads(line[len(_DAEMON_REPLY_PREFIX):])
+                    break
+        except (BrokenPipeError, ValueError) as exc:
+            raise ExportError(f"FreeCAD daemon failed while converting {job.source}: {exc}") from exc
+        if not reply.get("ok"):
+            return str(reply.get("error") or "unknown FreeCAD error")
+        if not job.step_path.exists():
+            return "FreeCAD finished without writing STEP output"
+        return None
+
+    def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is not None:
+            try:
+                if proc.stdin:
+                    proc.stdin.close()
+                proc.wait(timeout=30)
+            except (OSError, subprocess.TimeoutExpired):
+                proc.kill()
+                proc.wait()
+            if proc.stdout:
+                proc.stdout.close()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+
+def _pump_lines(stream: Any, lines: queue.SimpleQueue[str | None]) -> None:
+    try:
+        for line in stream:
+            lines.put(line)
+    except (OSError, ValueError):
+        pass  # stream closed by FreeCADDaemon.close()
+    finally:
+        lines.put(None)
+
+
+def convert_batch_to_step_with_freecad(
+    jobs: Sequence[FreecadJob],
+    freecad_bin: str,
+) -> list[str | None]:
+    """Run several CSG/STL -> STEP conversions inside one FreeCAD process.
+
+    Returns one entry per job: ``None`` on success, otherwise the error text
+    reported for that job. Only a failure of the FreeCAD process itself raises.
+    """
+    if not jobs:
+        return []
+    with FreeCADDaemon(freecad_bin) as daemon:
+        return [daemon.convert(job) for job in jobs]
+
+
+def _apply_openscad_mod_path(env: dict[str, str], freecad_user_home: Path) -> None:
+    user_mod = Path.home() / ".local" / "freecad_mods" / "Mod"
+    if not user_mod.exists():
+        repo_mod = freecad_user_home / "freecad_mods" / "Mod"
+        user_mod = repo_mod if repo_mod.exists() else None
+
+    if user_mod and user_mod.exists():
+        openscad_mod = user_mod / "OpenSCAD"
+        target_mod = openscad_mod if openscad_mod.exists() else user_mod
+        existing = env.get("PYTHONPATH")
+        env["PYTHONPATH"] = (
+            f"{target_mod}{os.pathsep}{existing}" if existing else str(target_mod)
+        )
+        env["OSC_FORGE_OPENSCAD_MOD"] = str(target_mod)
+
+
 def assemble_step_from_parts(
     parts: Sequence[StepAssemblyPart],
     step_path: Path,
-    freecad_bin: str,
+    freecad_bin: str | None,
+    *,
+    backend: str | None = None,
 ) -> None:
-    """Instantiate STEP parts with transforms and export combined STEP."""
+    """Instantiate STEP parts with transforms and export combined STEP.
+
+    ``backend`` (``export.step_assembly_backend``) is ``occ`` (in-process
+    OpenCASCADE via OCP/pythonocc-core), ``freecad``, or ``auto`` (default):
+    OCC when importable, with FreeCAD as fallback.
+    """
     if not parts:
         raise ExportError("no STEP parts provided for assembly")
     instructions = []
     for part in parts:
-        matrix = [[float(value) for value in row] for row in part.matrix]
-        instructions.append({"step": str(part.step_path), "matrix": matrix})
-
-    script = textwrap.dedent(
-        """
-        import json
-        import Part
-        import FreeCAD as App
-        import sys
-
-        if len(sys.argv) < 4:
-            raise SystemExit("usage: freecadcmd script.py assembly.json out.step")
-
-        data_path = sys.argv[2]
-        step_path = sys.argv[3]
-
-        with open(data_path, "r", encoding="utf-8") as handle:
-            entries = json.load(handle)
-
-        doc = App.newDocument("oscadforge_assembly")
-        objects = []
-        for idx, entry in enumerate(entries):
-            shape = Part.Shape()
-            shape.read(entry["step"])
-            obj = doc.addObject("Part::Feature", f"Panel_{idx}")
-            obj.Shape = shape
-            matrix = entry["matrix"]
-            if len(matrix) != 4 or any(len(row) != 4 for row in matrix):
-                raise SystemExit("invalid matrix; expected 4x4")
-            flat = [matrix[r][c] for r in range(4) for c in range(4)]
-            mat = App.Matrix(*flat)
-            obj.Placement = App.Placement(mat)
-            objects.append(obj)
-
-        doc.recompute()
-        if not objects:
-            raise SystemExit("no objects created for assembly")
-        Part.export(objects, step_path)
-        """
-    ).strip()
+        if len(part.matrix) != 4 or any(len(row) != 4 for row in part.matrix):
+            raise ExportError(f"invalid matrix for {part.step_path}; expected 4x4")
+        flat, mirror = _split_reflection(list(map(float, chain.from_iterable(part.matrix))))
+        instructions.append({"step": str(part.step_path), "matrix": flat, "mirror": mirror})
+
+    backend = str(backend or "auto").lower()
+    if backend not in {"auto", "occ", "freecad"}:
+        raise ExportError(f"unsupported STEP assembly backend '{backend}'")
+    if backend == "occ" or (backend == "auto" and _occ_modules() is not None):
+        try:
+            _assemble_step_with_occ(instructions, step_path)
+            return
+        except ExportError:
+            if backend == "occ" or not freecad_bin:
+                raise
+    if not freecad_bin:
+        raise ExportError("freecad binary not configured for assembly export")
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False, encoding="utf-8") as script_file:
-        script_file.write(script)
-        script_path = Path(script_file.name)
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8") as data_file:
-        json.dump(instructions, data_file)
-        data_path = Path(data_file.name)
+    script_path = _freecad_script_path(_FREECAD_ASSEMBLY_SCRIPT)
 
-    env = os.environ.copy()
-    repo_root = Path.cwd()
-    freecad_user_home = repo_root / "tooling" / "freecad_home"
-    freecad_user_home.mkdir(parents=True, exist_ok=True)
-    env["FREECAD_USER_HOME"] = str(freecad_user_home)
+    env = _tool_env("freecad")
 
+    with tempfile.TemporaryDirectory(prefix="oscadforge_") as workdir:
+        data_path = Path(workdir) / "assembly.json"
+        data_path.write_text(json.dumps(instructions), encoding="utf-8")
+        log_path = Path(workdir) / "freecad.log"
+        with log_path.open("w+b") as log:
+            try:
+                cmd = [
+                    freecad_bin,
+                    str(script_path),
+                    str(data_path),
+                    str(step_path),
+                ]
+                subprocess.run(cmd, check=True, stdout=log, stderr=subprocess.STDOUT, env=env)
+            except FileNotFoundError as exc:
+                raise ExportError(f"FreeCAD binary not found: {freecad_bin}") from exc
+            except subprocess.CalledProcessError as exc:
+                raise ExportError(
+                    f"FreeCAD STEP assembly failed ({exc.returncode}): {_log_tail(log)}"
+                ) from exc
+
+
+def _split_reflection(flat: list[float]) -> tuple[list[float], bool]:
+    """Split a row-major 4x4 frame into a proper rotation and a local z mirror.
+
+    Panel frames such as (x, z, y) are reflections (determinant -1). Neither
+    a FreeCAD Placement nor an OCC location can hold those, so the returned
+    matrix has its third column negated and ``True`` asks the assembler to
+    mirror the part across its local XY plane first; the product is the
+    original transform, as OpenSCAD's multmatrix applies it.
+    """
+    a, b, c = flat[0:3], flat[4:7], flat[8:11]
+    det = (
+        a[0] * (b[1] * c[2] - b[2] * c[1])
+        - a[1] * (b[0] * c[2] - b[2] * c[0])
+        + a[2] * (b[0] * c[1] - b[1] * c[0])
+    )
+    if det >= 0:
+        return flat, False
+    proper = list(flat)
+    for row in range(3):
+        proper[row * 4 + 2] = -proper[row * 4 + 2]
+    return proper, True
+
+
+@lru_cache(maxsize=1)
+def _occ_modules() -> dict[str, Any] | None:
+    """OpenCASCADE bindings (OCP, else pythonocc-core), or None if neither is installed."""
+    for prefix in ("OCP", "OCC.Core"):
+        try:
+            return {
+                name: importlib.import_module(f"{prefix}.{name}")
+                for name in (
+                    "BRep",
+                    "BRepBuilderAPI",
+                    "IFSelect",
+                    "STEPControl",
+                    "TopLoc",
+                    "TopoDS",
+                    "gp",
+                )
+            }
+        except ImportError:
+            continue
+    return None
+
+
+def _assemble_step_with_occ(instructions: Sequence[Mapping[str, Any]], step_path: Path) -> None:
+    """Same contract as the FreeCAD assembly script, without the FreeCAD process."""
+    occ = _occ_modules()
+    if occ is None:
+        raise ExportError("OpenCASCADE bindings not installed (pip install cadquery-ocp)")
+    ret_done = occ["IFSelect"].IFSelect_RetDone
+    gp = occ["gp"]
+    shapes: dict[tuple[str, bool], Any] = {}
+    builder = occ["BRep"].BRep_Builder()
+    compound = occ["TopoDS"].TopoDS_Compound()
+    builder.MakeCompound(compound)
     try:
-        cmd = [
-            freecad_bin,
-            str(script_path),
-            str(data_path),
-            str(step_path),
-        ]
-        subprocess.run(cmd, check=True, capture_output=True, text=True, env=env)
-    except FileNotFoundError as exc:
-        raise ExportError(f"FreeCAD binary not found: {freecad_bin}") from exc
-    except subprocess.CalledProcessError as exc:
-        stderr = exc.stderr or exc.stdout
-        raise ExportError(
-            f"FreeCAD STEP assembly failed ({exc.returncode}): {stderr}"
-        ) from exc
-    finally:
-        script_path.unlink(missing_ok=True)
-        data_path.unlink(missing_ok=True)
+        for entry in instructions:
+            source = entry["step"]
+            mirror = bool(entry.get("mirror"))
+            shape = shapes.get((source, mirror))
+            if shape is None:
+                shape = shapes.get((source, False))
+                if shape is None:
+                    reader = occ["STEPControl"].STEPControl_Reader()
+                    if reader.ReadFile(source) != ret_done:
+                        raise ExportError(f"OCC could not read STEP part {source}")
+                    reader.TransferRoots()
+                    shape = shapes[(source, False)] = reader.OneShape()
+                if mirror:
+                    # Locations must stay rigid, so the reflection is baked
+                    # into a mirrored copy of the geometry instead.
+                    reflect = gp.gp_Trsf()
+                    reflect.SetMirror(gp.gp_Ax2(gp.gp_Pnt(0, 0, 0), gp.gp_Dir(0, 0, 1)))
+                    transform = occ["BRepBuilderAPI"].BRepBuilderAPI_Transform(shape, reflect, True)
+                    shape = shapes[(source, True)] = transform.Shape()
+            m = entry["matrix"]
+            trsf = gp.gp_Trsf()
+            trsf.SetValues(m[0], m[1], m[2], m[3], m[4], m[5], m[6], m[7], m[8], m[9], m[10], m[11])
+            builder.Add(compound, shape.Moved(occ["TopLoc"].TopLoc_Location(trsf)))
+        writer = occ["STEPControl"].STEPControl_Writer()
+        writer.Transfer(compound, occ["STEPControl"].STEPControl_AsIs)
+        ensure_directory(step_path.parent)
+        if writer.Write(str(step_path)) != ret_done:
+            raise ExportError(f"OCC could not write STEP assembly {step_path}")
+    except ExportError:
+        raise
+    except Exception as exc:  # OCC raises its own Standard_Failure types
+        raise ExportError(f"OCC STEP assembly failed: {exc}") from exc
 
 
 def export_step_artifacts_parallel(
     tasks: Sequence[StepExportTask],
     *,
     max_workers: int | None = None,
+    executor: str | None = None,
 ) -> list[tuple[StepExportTask, StepExportResult]]:
+    """Export STEP files for many tasks.
+
+    OpenSCAD work (CSG/STL generation, dedup hashing) runs per task on a
+    thread pool, or on a process pool with ``executor="process"`` (defaults to
+    ``export.step_executor``). The remaining FreeCAD conversions are fed to
+    long-lived FreeCAD daemons, so FreeCAD starts once per daemon instead of
+    once per task. Conversions are CPU-bound, so there is at most one daemon
+    per CPU (or ``max_workers``) even when the thread pool is wider.
+    """
     if not tasks:
         return []
+    if executor is None:
+        executor = str(tasks[0].export_cfg.get("step_executor", "thread") or "thread")
+    executor = executor.lower()
+    if executor not in {"thread", "process"}:
+        raise ExportError(f"unknown step executor '{executor}' (expected 'thread' or 'process')")
+    cpu_count = os.cpu_count() or 1
+    if max_workers:
+        workers = max_workers
+    elif executor == "process":
+        workers = min(len(tasks), cpu_count)
+    else:
+        workers = min(len(tasks), 2 * cpu_count)
+    freecad_workers = max_workers or min(workers, cpu_count)
+    pool_cls = (
+        concurrent.futures.ProcessPoolExecutor
+        if executor == "process"
+        else concurrent.futures.ThreadPoolExecutor
+    )
     results: list[StepExportResult | None] = [None] * len(tasks)
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_map: dict[concurrent.futures.Future[StepExportResult], int] = {}
-        for idx, task in enumerate(tasks):
-            future = executor.submit(
-                export_step_artifact,
-                task.scad_path,
-                task.step_path,
-                export_cfg=task.export_cfg,
-                openscad_bin=task.openscad_bin,
-                freecad_bin=task.freecad_bin,
-                stl_path=task.stl_path,
-            )
-            future_map[future] = idx
-        for future in concurrent.futures.as_completed(future_map):
-            idx = future_map[future]
-            results[idx] = future.result()
+    prepared: list[_PreparedStepExport | None] = [None] * len(tasks)
+    # Temp CSG/STL files are removed in the background as soon as their task
+    # no longer needs them, overlapping cleanup with the remaining exports.
+    cleanup_pool = concurrent.futures.ThreadPoolExecutor(
+        max_workers=2, thread_name_prefix="oscadforge-cleanup"
+    )
+
+    def discard_temp_files(entry: _PreparedStepExport) -> None:
+        paths, entry.temp_paths = entry.temp_paths, []
+        for path in paths:
+            cleanup_pool.submit(path.unlink, missing_ok=True)
+
+    # Tasks normally share one export config, so build one dedup manager per
+    # (config, backend) instead of one per task.
+    managers: dict[tuple[int, str], StepDedupManager] = {}
+    try:
+        with pool_cls(max_workers=workers) as pool:
+            future_map = {}
+            for idx, task in enumerate(_preflight_step_backends(tasks)):
+                backend = task.resolved_backend or "openscad"
+                dedup_cfg = task.export_cfg.get("step_dedup")
+                key = (id(dedup_cfg), backend)
+                if key not in managers:
+                    managers[key] = StepDedupManager.from_config(
+                        dedup_cfg,
+                        default_cache_dir=default_step_cache_dir(backend),
+                    )
+                future_map[pool.submit(_prepare_step_export, task, managers[key])] = idx
+            first_error: BaseException | None = None
+            for future in concurrent.futures.as_completed(future_map):
+                idx = future_map[future]
+                try:
+                    entry = future.result()
+                except Exception as exc:
+                    # Keep collecting so finished tasks still get cleaned up.
+                    first_error = first_error or exc
+                    continue
+                prepared[idx] = entry
+                if entry.result is not None:
+                    _record_dedup_source(entry)
+                    discard_temp_files(entry)
+            if first_error is not None:
+                raise first_error
+
+        pending: list[int] = []
+        for idx, entry in enumerate(prepared):
+            assert entry is not None
+            if entry.result is not None:
+                results[idx] = entry.result
+            else:
+                pending.append(idx)
+
+        failed = _run_freecad_jobs(
+            [(idx, prepared[idx].freecad_job) for idx in pending],
+            prepared,
+            freecad_workers,
+        )
+        retry: list[tuple[int, FreecadJob]] = []
+        for idx, error in failed:
+            entry = prepared[idx]
+            if entry.freecad_job.kind != "csg" or not entry.allow_stl_fallback:
+                raise ExportError(f"FreeCAD STEP conversion failed for {entry.task.scad_path}: {error}")
+            retry.append((idx, _stl_fallback_job(entry)))
+        for idx, error in _run_freecad_jobs(retry, prepared, freecad_workers):
+            raise ExportError(f"FreeCAD STEP conversion failed for {prepared[idx].task.scad_path}: {error}")
+
+        for idx in pending:
+            entry = prepared[idx]
+            entry.result = results[idx] = _finish_step_export(entry)
+            _record_dedup_source(entry)
+            discard_temp_files(entry)
+    finally:
+        for entry in prepared:
+            if entry is not None:
+                discard_temp_files(entry)
+        cleanup_pool.shutdown(wait=True)
+        for manager in managers.values():
+            manager.save_source_index()
     return [(task, results[i]) for i, task in enumerate(tasks) if results[i] is not None]
 
 
+def _run_freecad_jobs(
+    jobs: Sequence[tuple[int, FreecadJob]],
+    prepared: Sequence[_PreparedStepExport | None],
+    workers: int,
+) -> list[tuple[int, str]]:
+    """Run ``jobs`` on up to ``workers`` FreeCAD daemons per binary; return the failures.
+
+    Each daemon pulls the next job from a shared queue, so one slow part does
+    not hold back a whole pre-assigned chunk. A daemon that crashes fails only
+    the job it was working on and is restarted for the rest.
+    """
+    if not jobs:
+        return []
+    by_binary: dict[str, queue.SimpleQueue[tuple[int, FreecadJob]]] = {}
+    counts: dict[str, int] = {}
+    for idx, job in jobs:
+        freecad_bin = prepared[idx].task.freecad_bin
+        by_binary.setdefault(freecad_bin, queue.SimpleQueue()).put((idx, job))
+        counts[freecad_bin] = counts.get(freecad_bin, 0) + 1
+
+    failures: list[tuple[int, str]] = []
+    failures_lock = threading.Lock()
+
+    def drain(freecad_bin: str, pending: queue.SimpleQueue[tuple[int, FreecadJob]]) -> None:
+        daemon = FreeCADDaemon(freecad_bin)
+        try:
+            while True:
+                try:
+                    idx, job = pending.get_nowait()
+                except queue.Empty:
+                    return
+                if not daemon.alive:
+                    daemon.close()
+                    daemon.start()
+                try:
+                    error = daemon.convert(job)
+                except ExportError as exc:
+                    error = str(exc)
+                if error is not None:
+                    with failures_lock:
+                        failures.append((idx, error))
+        finally:
+            daemon.close()
+
+    runners = [
+        (freecad_bin, pending)
+        for freecad_bin, pending in by_binary.items()
+        for _ in range(max(1, min(workers, counts[freecad_bin])))
+    ]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(runners)) as executor:
+        for future in [executor.submit(drain, *runner) for runner in runners]:
+            future.result()
+    return failures
+
+
+def lookup_cached_step(
+    task: StepExportTask,
+    managers: dict[str, StepDedupManager] | None = None,
+) -> StepExportResult | None:
+    """Link a cached STEP for ``task.source_key`` without touching its SCAD.
+
+    Returns ``None`` when dedup is off, the key is unknown or the cache entry
+    is gone; the task then has to be exported normally (which records the
+    key). The SCAD need not exist yet, so auto backends assume it imports no
+    STL unless ``task.stl_path`` exists. Callers looking up many tasks of one
+    build pass the same ``managers`` dict, which holds one dedup manager per
+    backend.
+    """
+    if not task.source_key:
+        return None
+    requested = str(task.export_cfg.get("step_backend", "openscad") or "openscad").lower()
+    backend = task.resolved_backend or _resolve_step_backend(
+        requested, task.scad_path, task.stl_path
+    )
+    dedup = managers.get(backend) if managers is not None else None
+    if dedup is None:
+        dedup = StepDedupManager.from_config(
+            task.export_cfg.get("step_dedup"),
+            default_cache_dir=default_step_cache_dir(backend),
+        )
+        if managers is not None:
+            managers[backend] = dedup
+    digest = dedup.lookup_source(
+        _toolchain_source_key(task.source_key, replace(task, resolved_backend=backend))
+    )
+    if not digest:
+        return None
+    cache_path = dedup.cache_path_for_hash(digest)
+    if not dedup.is_cached(cache_path):
+        return None
+    try:
+        dedup.link_to_output(cache_path, task.step_path)
+    except ExportError:
+        dedup.forget(cache_path)
+        return None
+    return StepExportResult(
+        step_path=task.step_path,
+        cache_path=cache_path,
+        dedup_hit=True,
+        dedup_hash=digest,
+    )
+
+
+def _toolchain_source_key(source_key: str, task: StepExportTask) -> str:
+    """Qualify a dedup source key with the binaries and backend settings.
+
+    The same SCAD source maps to a different STEP once the OpenSCAD/FreeCAD
+    binary, the geometry kernel or the mesh tolerance changes.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for part in (
+        task.resolved_backend,
+        task.openscad_bin,
+        task.freecad_bin,
+        task.export_cfg.get("openscad_backend", "manifold"),
+        _mesh_tolerance(task.export_cfg),
+    ):
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return f"{source_key}:{digest.hexdigest()}"
+
+
+def default_step_cache_dir(backend: str) -> Path:
+    """Shared content-addressed STEP store, one subdirectory per backend.
+
+    Different backends turn the same CSG into different STEP files, so their
+    entries must not collide.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base).expanduser() / "oscadforge" / "step" / backend
+
+
+# Process-local memo of CSG hashes keyed by (path, size, mtime_ns) and of
+# cache entries already seen on disk, so rebuilds within one session skip
+# re-reading the CSG and re-statting the cache.
+_CSG_HASH_CACHE: dict[tuple[str, int, int], str] = {}
+_CSG_HASH_CACHE_MAX = 4096
+_KNOWN_CACHE_ENTRIES: set[str] = set()
+
+# Per cache dir: "<scad dir>:<scad sha256>" -> CSG hash, persisted as
+# <cache_dir>/_source_index.json so unchanged SCAD sources skip the CSG
+# compile entirely on later runs. Dirty flags track unsaved additions.
+_SOURCE_INDEX_NAME = "_source_index.json"
+_SOURCE_INDEXES: dict[str, dict[str, str]] = {}
+_SOURCE_INDEX_DIRTY: set[str] = set()
+_SOURCE_INDEX_LOCK = threading.Lock()
+
+
+def _hash_file(path: Path) -> str:
+    stat = path.stat()
+    key = (str(path), stat.st_size, stat.st_mtime_ns)
+    cached = _CSG_HASH_CACHE.get(key)
+    if cached is not None:
+        return cached
+    with path.open("rb") as handle:
+        if hasattr(hashlib, "file_digest"):
+            digest = hashlib.file_digest(handle, "sha256").hexdigest()
+        elif stat.st_size == 0:
+            digest = hashlib.sha256().hexdigest()
+        else:
+            # Python < 3.11: hash the whole mapping in one C call.
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest = hashlib.sha256(mapped).hexdigest()
+    if len(_CSG_HASH_CACHE) >= _CSG_HASH_CACHE_MAX:
+        _CSG_HASH_CACHE.pop(next(iter(_CSG_HASH_CACHE)), None)
+    _CSG_HASH_CACHE[key] = digest
+    return digest
+
+
 class StepDedupManager:
     """Handle hashing + caching of STEP exports derived from CSG."""
 
@@ -526,7 +1381,7 @@ class StepDedupManager:
         default_cache_dir: Path,
     ) -> StepDedupManager:
         if not cfg:
-            return cls(False, None, "symlink")
+            return cls(False, None, "hardlink")
         if isinstance(cfg, Mapping):
             enabled = bool(cfg.get("enabled", True))
             cfg_map: Mapping[str, Any] = cfg
@@ -537,28 +1392,90 @@ class StepDedupManager:
             enabled = True
             cfg_map = {}
         if not enabled:
-            return cls(False, None, "symlink")
+            return cls(False, None, "hardlink")
         cache_dir_value = cfg_map.get("cache_dir")
         cache_dir = (
             Path(cache_dir_value).expanduser()
             if cache_dir_value
             else default_cache_dir
         )
-        link_mode = str(cfg_map.get("link", "symlink")).lower()
+        # Hardlinks survive cleaning the shared cache; symlinks would dangle.
+        link_mode = str(cfg_map.get("link", "hardlink")).lower()
         if link_mode not in {"symlink", "hardlink", "copy"}:
-            link_mode = "symlink"
+            link_mode = "hardlink"
         return cls(True, cache_dir, link_mode)
 
     def hash_csg(self, csg_path: Path) -> str:
         if not self.enabled:
             raise RuntimeError("step dedup disabled")
-        digest = hashlib.sha256()
-        with csg_path.open("rb") as handle:
-            for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-                if not chunk:
-                    break
-                digest.update(chunk)
-        return digest.hexdigest()
+        return _hash_file(csg_path)
+
+    def source_key(self, scad_path: Path) -> str:
+        """Index key for a SCAD source: its directory (relative includes), content
+        hash and the stamp of the files it includes (see scad_dependency_stamp)."""
+        return (
+            f"{scad_path.parent}:{_hash_file(scad_path)}:"
+            f"{scad_dependency_stamp([scad_path], include_roots=False)}"
+        )
+
+    def _source_index(self) -> dict[str, str]:
+        # Caller holds _SOURCE_INDEX_LOCK.
+        assert self.cache_dir is not None
+        index_key = str(self.cache_dir)
+        index = _SOURCE_INDEXES.get(index_key)
+        if index is None:
+            try:
+                data = json.loads((self.cache_dir / _SOURCE_INDEX_NAME).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            index = data if isinstance(data, dict) else {}
+            _SOURCE_INDEXES[index_key] = index
+        return index
+
+    def lookup_source(self, source_key: str) -> str | None:
+        if not self.enabled:
+            return None
+        with _SOURCE_INDEX_LOCK:
+            return self._source_index().get(source_key)
+
+    def record_source(self, source_key: str | None, digest: str | None) -> None:
+        if not self.enabled or not source_key or not digest:
+            return
+        with _SOURCE_INDEX_LOCK:
+            index = self._source_index()
+            if index.get(source_key) != digest:
+                index[source_key] = digest
+                _SOURCE_INDEX_DIRTY.add(str(self.cache_dir))
+
+    def save_source_index(self) -> None:
+        if not self.enabled or self.cache_dir is None:
+            return
+        index_key = str(self.cache_dir)
+        with _SOURCE_INDEX_LOCK:
+            if index_key not in _SOURCE_INDEX_DIRTY:
+                return
+            payload = json.dumps(_SOURCE_INDEXES[index_key])
+            _SOURCE_INDEX_DIRTY.discard(index_key)
+        ensure_directory(self.cache_dir)
+        index_path = self.cache_dir / _SOURCE_INDEX_NAME
+        tmp_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(payload, encoding="utf-8")
+            os.replace(tmp_path, index_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+    def is_cached(self, cache_path: Path) -> bool:
+        key = str(cache_path)
+        if key in _KNOWN_CACHE_ENTRIES:
+            return True
+        if cache_path.exists():
+            _KNOWN_CACHE_ENTRIES.add(key)
+            return True
+        return False
+
+    def forget(self, cache_path: Path) -> None:
+        _KNOWN_CACHE_ENTRIES.discard(str(cache_path))
 
     def cache_path_for_hash(self, digest: str) -> Path:
         if not self.enabled or self.cache_dir is None:
@@ -566,6 +1483,20 @@ class StepDedupManager:
         ensure_directory(self.cache_dir)
         return self.cache_dir / f"{digest}.step"
 
+    def write_metadata(self, cache_path: Path | None, *, scad_path: Path, backend: str) -> None:
+        """Record where a cache entry came from (``<sha>.meta.json``) for eviction tooling."""
+        if not self.enabled or cache_path is None:
+            return
+        meta = {
+            "scad_path": str(scad_path),
+            "backend": backend,
+            "created": time.time(),
+        }
+        try:
+            cache_path.with_suffix(".meta.json").write_text(json.dumps(meta), encoding="utf-8")
+        except OSError:
+            pass
+
     def link_to_output(self, source: Path | None, target: Path) -> None:
         if not self.enabled or source is None:
             return
@@ -594,6 +1525,175 @@ class StepDedupManager:
             shutil.copy2(source, target)
 
 
+# include <...>, use <...> and import("...") references in SCAD sources.
+_SCAD_REFERENCE_RE = re.compile(
+    rb'\b(?:include|use)\s*<([^>]+)>|\bimport\s*\(\s*(?:file\s*=\s*)?"([^"]+)"'
+)
+# Process-local memo of each SCAD file's references keyed by (path, size,
+# mtime_ns), so large libraries like BOSL2 are scanned once per session.
+_SCAD_REFERENCE_CACHE: dict[tuple[str, int, int], tuple[str, ...]] = {}
+_SCAD_REFERENCE_CACHE_MAX = 4096
+
+
+def _scad_references(path: Path, stat: os.stat_result) -> tuple[str, ...]:
+    key = (str(path), stat.st_size, stat.st_mtime_ns)
+    refs = _SCAD_REFERENCE_CACHE.get(key)
+    if refs is None:
+        refs = tuple(
+            (match.group(1) or match.group(2)).decode("utf-8", errors="replace").strip()
+            for match in _SCAD_REFERENCE_RE.finditer(path.read_bytes())
+        )
+        if len(_SCAD_REFERENCE_CACHE) >= _SCAD_REFERENCE_CACHE_MAX:
+            _SCAD_REFERENCE_CACHE.pop(next(iter(_SCAD_REFERENCE_CACHE)), None)
+        _SCAD_REFERENCE_CACHE[key] = refs
+    return refs
+
+
+def scad_dependency_stamp(roots: Iterable[Path], *, include_roots: bool = True) -> str:
+    """Digest the size and mtime of every file ``roots`` include, use or import.
+
+    References resolve like OpenSCAD does: next to the referencing file, then
+    along ``OPENSCADPATH`` (see ``_tool_env``). Unresolvable references are
+    hashed by name, so the stamp changes once they appear. With
+    ``include_roots=False`` the roots themselves are only scanned, for
+    callers that already hash their content.
+    """
+    search_dirs = [
+        Path(entry)
+        for entry in _tool_env("openscad").get("OPENSCADPATH", "").split(os.pathsep)
+        if entry
+    ]
+    digest = hashlib.blake2b(digest_size=16)
+    root_paths = [Path(root).resolve() for root in roots]
+    pending = list(root_paths)
+    seen: set[Path] = set()
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            digest.update(f"missing:{path}\n".encode("utf-8"))
+            continue
+        if include_roots or path not in root_paths:
+            digest.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+        if path.suffix.lower() != ".scad":
+            continue
+        for ref in _scad_references(path, stat):
+            for base in (path.parent, *search_dirs):
+                candidate = base / ref
+                if candidate.is_file():
+                    pending.append(candidate.resolve())
+                    break
+            else:
+                digest.update(f"unresolved:{path}:{ref}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """Content-addressed cache of OpenSCAD outputs (STL, PNG, ...).
+
+    Keyed on the SCAD bytes, its directory (relative includes), the size and
+    mtime of every file it includes, uses or imports, the binary, the export
+    arguments and the output type, so re-running an unchanged artifact copies
+    the previous output instead of invoking OpenSCAD.
+    """
+
+    def __init__(self, cache_dir: Path | None) -> None:
+        self.cache_dir = cache_dir
+
+    @property
+    def enabled(self) -> bool:
+        return self.cache_dir is not None
+
+    @classmethod
+    def from_config(cls, cfg: Any) -> RenderCache:
+        if not cfg:
+            return cls(None)
+        cfg_map: Mapping[str, Any] = cfg if isinstance(cfg, Mapping) else {}
+        if not cfg_map.get("enabled", True):
+            return cls(None)
+        cache_dir_value = cfg_map.get("cache_dir")
+        if cache_dir_value:
+            cache_dir = Path(cache_dir_value).expanduser()
+        else:
+            base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+            cache_dir = Path(base).expanduser() / "oscadforge" / "render"
+        return cls(cache_dir)
+
+    def key_for(
+        self,
+        scad_path: Path,
+        output_path: Path,
+        openscad_bin: str,
+        extra_args: Optional[Sequence[str]],
+    ) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (str(scad_path.resolve().parent), openscad_bin, *(extra_args or ())):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(scad_path.read_bytes())
+        digest.update(scad_dependency_stamp([scad_path], include_roots=False).encode("ascii"))
+        return f"{digest.hexdigest()}{output_path.suffix.lower()}"
+
+    def restore(self, key: str, output_path: Path) -> bool:
+        assert self.cache_dir is not None
+        cached = self.cache_dir / key
+        if not cached.is_file():
+            return False
+        ensure_directory(output_path.parent)
+        shutil.copyfile(cached, output_path)
+        return True
+
+    def store(self, key: str, output_path: Path) -> None:
+        assert self.cache_dir is not None
+        if not output_path.is_file():
+            return
+        ensure_directory(self.cache_dir)
+        target = self.cache_dir / key
+        tmp_path = target.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            shutil.copyfile(output_path, tmp_path)
+            os.replace(tmp_path, target)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+
+def usable_cpus() -> int:
+    """CPUs this process may run on (cgroup/taskset aware where supported)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 4
+
+
+def openscad_workers() -> int:
+    """Concurrent OpenSCAD renders; half the usable cores unless overridden.
+
+    Each OpenSCAD child can use several threads itself (Manifold backend), so
+    one child per core oversubscribes the machine. ``OSCADFORGE_PNG_WORKERS``
+    sets the count explicitly.
+    """
+    default = max(1, usable_cpus() // 2)
+    return max(1, int(os.getenv("OSCADFORGE_PNG_WORKERS") or default))
+
+
+def openscad_backend_args(export_cfg: Mapping[str, Any], openscad_bin: Optional[str]) -> list[str]:
+    """Return the ``--backend`` flag for geometry renders (STL/STEP).
+
+    ``export.openscad_backend`` defaults to ``manifold``; ``cgal`` keeps the
+    classic kernel and ``false``/``none`` passes no flag. Binaries without a
+    ``--backend`` option (before 2024.09) render with their built-in default.
+    """
+    backend = export_cfg.get("openscad_backend", "manifold")
+    if not backend or str(backend).lower() == "none" or not openscad_bin:
+        return []
+    if not _openscad_supports(openscad_bin, "--backend"):
+        return []
+    return [f"--backend={backend}"]
+
+
 def build_png_args(cfg: Optional[object]) -> tuple[bool, list[str]]:
     if cfg is None:
         return False, []
@@ -6,38 +6,84 @@ from typing import Any, Iterable, Mapping
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _Loader
+
 
 class ConfigError(RuntimeError):
     """Raised when a config file cannot be parsed or merged."""
 
 
+_PRIMITIVE_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def _copy_value(value: Any) -> Any:
+    if type(value) in _PRIMITIVE_TYPES:
+        return value
+    return copy.deepcopy(value)
+
+
 def deep_merge(base: Any, incoming: Any) -> Any:
-    if isinstance(base, dict) and isinstance(incoming, Mapping):
-        merged = {**base}
-        for key, value in incoming.items():
-            if key in merged:
-                merged[key] = deep_merge(merged[key], value)
+    if not (isinstance(base, dict) and isinstance(incoming, Mapping)):
+        if isinstance(base, list) and isinstance(incoming, list):
+            return base + incoming
+        return _copy_value(incoming)
+    merged = {**base}
+    stack: list[tuple[dict, Mapping]] = [(merged, incoming)]
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            if key not in target:
+                target[key] = _copy_value(value)
+                continue
+            current = target[key]
+            if isinstance(current, dict) and isinstance(value, Mapping):
+                nested = {**current}
+                target[key] = nested
+                stack.append((nested, value))
+            elif isinstance(current, list) and isinstance(value, list):
+                target[key] = current + value
             else:
-                merged[key] = copy.deepcopy(value)
-        return merged
-    if isinstance(base, list) and isinstance(incoming, list):
-        return base + incoming
-    return copy.deepcopy(incoming)
+                target[key] = _copy_value(value)
+    return merged
+
+
+# resolved path -> (mtime_ns, size, parsed config); callers get deep copies.
+# Only the latest version of each file is kept, and at most
+# _YAML_CACHE_MAX files, so long-lived processes do not accumulate configs.
+_YAML_CACHE: dict[str, tuple[int, int, dict]] = {}
+_YAML_CACHE_MAX = 32
 
 
 def load_yaml(path: Path) -> dict:
     try:
-        data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+        stat = path.stat()
+    except OSError:
+        stat = None
+    key = str(path.resolve()) if stat else None
+    cached = _YAML_CACHE.get(key) if key else None
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return copy.deepcopy(cached[2])
+    try:
+        data = yaml.load(path.read_text(encoding="utf-8"), Loader=_Loader) or {}
     except yaml.YAMLError as exc:
         raise ConfigError(f"Invalid YAML in {path}") from exc
     if not isinstance(data, Mapping):
         raise ConfigError(f"Config root in {path} must be a mapping")
-    return dict(data)
+    data = dict(data)
+    if key:
+        _YAML_CACHE.pop(key, None)
+        if len(_YAML_CACHE) >= _YAML_CACHE_MAX:
+            _YAML_CACHE.pop(next(iter(_YAML_CACHE), None), None)
+        _YAML_CACHE[key] = (stat.st_mtime_ns, stat.st_size, copy.deepcopy(data))
+    return data
 
 
 def load_yaml_string(content: str) -> dict:
     try:
-        data = yaml.safe_load(content) or {}
+        data = yaml.load(content, Loader=_Loader) or {}
     except yaml.YAMLError as exc:
         raise ConfigError("Invalid YAML from stdin") from exc
     if not isinstance(data, Mapping):
@@ -59,4 +105,7 @@ def load_and_merge(paths: Iterable[Path]) -> dict:
         if not path.exists():
             raise FileNotFoundError(path)
         dicts.append(load_yaml(path))
+    if len(dicts) == 1:
+        # Freshly parsed, nothing to merge into or protect from aliasing.
+        return dicts[0]
     return merge_dicts(dicts)
@@ -1,5 +1,17 @@
 """Model registry implementations."""
 
-from . import opengrid_papierkorb, opengrid_beam_papierkorb, papierkorb, solar_bus
+from __future__ import annotations
+
+import importlib
+from typing import Any
 
 __all__ = ["opengrid_papierkorb", "opengrid_beam_papierkorb", "papierkorb", "solar_bus"]
+
+
+def __getattr__(name: str) -> Any:
+    # Import model packages on first access so the CLI only pays for the one it builds.
+    if name in __all__:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
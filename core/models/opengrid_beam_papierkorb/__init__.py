@@ -1,30 +1,35 @@
 from __future__ import annotations
 
 import os
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
 
 from ...engine import BuildContext, EngineResult
 from ...export import (
     ExportError,
+    RenderCache,
     StepAssemblyPart,
     StepExportTask,
     assemble_step_from_parts,
     build_png_args,
     export_step_artifacts_parallel,
+    openscad_backend_args,
     run_openscad,
 )
 from ...preview import RectPrismSpec, render_isometric_preview
 from ..papierkorb import layout as layout_builder
 from ..papierkorb.layout import LayoutConfig, PanelPlacement
+from ..papierkorb.scad_writer import write_scad
 from .connectors import ConnectorPlan, plan_connectors
 from .panels import OpenGridPanelSet, build_panels
 from .params import OpenGrid2Params
 from .scad_writer import (
     BeamPlacementMode,
     IncludePaths,
+    build_panel_modules,
     build_scad_for_artifact,
     build_scad_for_panel,
     placement_matrix,
@@ -74,6 +79,7 @@ def build(context: BuildContext) -> EngineResult:
         raise ValueError("no layout artifacts produced; check layout.mode configuration")
 
     png_enabled, png_args = build_png_args(context.export.get("png"))
+    render_cache = RenderCache.from_config(context.export.get("render_cache"))
     assembly_mode = str(context.export.get("step_assembly", "panel") or "panel").lower()
     panel_assembly_enabled = assembly_mode == "panel"
     scad_primary: Path | None = None
@@ -105,7 +111,7 @@ def build(context: BuildContext) -> EngineResult:
                 board=params.board,
                 includes=includes,
             )
-            panel_scad_path.write_text(panel_scad_text, encoding="utf-8")
+            write_scad(panel_scad_path, panel_scad_text)
             panel_scad_paths[panel.panel_id] = panel_scad_path
             panel_step_path = context.out_dir / f"panel_geom_{panel.panel_id}.step"
             step_tasks.append(
@@ -128,14 +134,15 @@ def build(context: BuildContext) -> EngineResult:
         params.connectors,
         includes,
         include_preview_imports,
+        context.out_dir,
+        executor=str(context.export.get("scad_executor", "thread") or "thread"),
     )
 
+    stl_jobs: List[Tuple[Path, Path]] = []
     for rendered in rendered_artifacts:
         artifact = rendered.artifact
         placements = rendered.placements
-        scad_text = rendered.scad_text
-        scad_path = context.out_dir / f"{artifact.basename}.scad"
-        scad_path.write_text(scad_text, encoding="utf-8")
+        scad_path = rendered.scad_path
         if scad_primary is None:
             scad_primary = scad_path
         logs.append(f"SCAD written to {scad_path}")
@@ -145,9 +152,8 @@ def build(context: BuildContext) -> EngineResult:
 
         if context.export.get("stl"):
             stl_path = context.out_dir / f"{artifact.basename}.stl"
-            run_openscad(scad_path, stl_path, context.openscad_bin)
+            stl_jobs.append((scad_path, stl_path))
             stl_paths.append(stl_path)
-            logs.append(f"STL written to {stl_path}")
             artifact_stl = stl_path
 
         if context.export.get("step") and (artifact.label != "assembled" or not panel_assembly_enabled):
@@ -181,6 +187,7 @@ def build(context: BuildContext) -> EngineResult:
                     png_path=png_path,
                     preview_prisms=artifact.preview_prisms,
                     png_args=png_args,
+                    fast_preview=bool(context.export.get("png_fast_preview")),
                 )
             )
 
@@ -204,75 +211,110 @@ def build(context: BuildContext) -> EngineResult:
             )
             continue
 
-    if step_tasks:
-        for task, step_result in export_step_artifacts_parallel(step_tasks):
-            meta = task.metadata or {}
-            if meta.get("panel_step") and meta.get("panel_id"):
-                panel_id = str(meta["panel_id"])
-                panel_step_sources[panel_id] = step_result.step_path
-                logs.append(f"STEP panel {panel_id} -> {step_result.step_path}")
-                continue
+    # OpenSCAD has no batch or server mode, so the STL and PNG renders share
+    # one bounded pool of OpenSCAD processes. STLs are joined before the STEP
+    # stage; PNGs depend on no STEP output and finish in the background while
+    # the STEP exports and the panel assembly proceed.
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(16, os.cpu_count() or 1)), thread_name_prefix="oscadforge-render"
+    ) as render_pool:
+        stl_args = openscad_backend_args(context.export, context.openscad_bin)
+        stl_futures = [
+            (
+                stl_path,
+                render_pool.submit(
+                    run_openscad,
+                    scad_path,
+                    stl_path,
+                    context.openscad_bin,
+                    stl_args,
+                    cache=render_cache,
+                ),
+            )
+            for scad_path, stl_path in stl_jobs
+        ]
+        png_futures = [
+            render_pool.submit(_run_single_png_task, task, context.openscad_bin, render_cache)
+            for task in png_tasks
+        ]
+        for stl_path, future in stl_futures:
+            future.result()
+            logs.append(f"STL written to {stl_path}")
 
-            step_paths.append(step_result.step_path)
-            basename = meta.get("artifact_basename")
-            if basename and basename in artifact_record_map:
-                artifact_record_map[basename]["step"] = str(step_result.step_path)
-            if step_result.dedup_hit and step_result.cache_path:
-                logs.append(
-                    f"STEP linked to cached geometry {step_result.cache_path} -> {step_result.step_path}"
-                )
-            else:
-                logs.append(f"STEP written to {step_result.step_path}")
-
-    if png_enabled and png_tasks:
-        png_logs = _run_png_tasks_concurrently(png_tasks, context.openscad_bin)
-        logs.extend(png_logs)
-
-    if assembly_plan and context.export.get("step") and panel_assembly_enabled:
-        try:
-            if not context.freecad_bin:
-                raise ExportError("freecad binary not configured for assembly export")
-            parts: List[StepAssemblyPart] = []
-            missing_panels: List[str] = []
-            for placement in assembly_plan.placements:
-                panel_id = placement.panel.panel_id
-                step_source = panel_step_sources.get(panel_id)
-                if not step_source:
-                    missing_panels.append(panel_id)
+        if step_tasks:
+            for task, step_result in export_step_artifacts_parallel(step_tasks):
+                meta = task.metadata or {}
+                if meta.get("panel_step") and meta.get("panel_id"):
+                    panel_id = str(meta["panel_id"])
+                    panel_step_sources[panel_id] = step_result.step_path
+                    logs.append(f"STEP panel {panel_id} -> {step_result.step_path}")
                     continue
-                parts.append(
-                    StepAssemblyPart(
-                        step_path=step_source,
-                        matrix=placement_matrix(placement),
+
+                step_paths.append(step_result.step_path)
+                basename = meta.get("artifact_basename")
+                if basename and basename in artifact_record_map:
+                    artifact_record_map[basename]["step"] = str(step_result.step_path)
+                if step_result.dedup_hit and step_result.cache_path:
+                    logs.append(
+                        f"STEP linked to cached geometry {step_result.cache_path} -> {step_result.step_path}"
                     )
+                else:
+                    logs.append(f"STEP written to {step_result.step_path}")
+
+        png_log_index = len(logs)
+
+        if assembly_plan and context.export.get("step") and panel_assembly_enabled:
+            try:
+                parts: List[StepAssemblyPart] = []
+                missing_panels: List[str] = []
+                for placement in assembly_plan.placements:
+                    panel_id = placement.panel.panel_id
+                    step_source = panel_step_sources.get(panel_id)
+                    if not step_source:
+                        missing_panels.append(panel_id)
+                        continue
+                    parts.append(
+                        StepAssemblyPart(
+                            step_path=step_source,
+                            matrix=placement_matrix(placement),
+                        )
+                    )
+                if missing_panels:
+                    raise ExportError(
+                        f"missing STEP panels for assembly: {', '.join(sorted(set(missing_panels)))}"
+                    )
+                assemble_step_from_parts(
+                    parts,
+                    assembly_plan.step_path,
+                    context.freecad_bin,
+                    backend=context.export.get("step_assembly_backend"),
                 )
-            if missing_panels:
-                raise ExportError(
-                    f"missing STEP panels for assembly: {', '.join(sorted(set(missing_panels)))}"
-                )
-            assemble_step_from_parts(parts, assembly_plan.step_path, context.freecad_bin)
-            step_paths.append(assembly_plan.step_path)
-            assembly_plan.record["step"] = str(assembly_plan.step_path)
-            logs.append(
-                f"STEP assembled from {len(parts)} panels -> {assembly_plan.step_path}"
-            )
-        except ExportError as exc:
-            logs.append(f"STEP assembly fallback via SCAD export ({exc})")
-            fallback = export_step_artifact(
-                assembly_plan.scad_path,
-                assembly_plan.step_path,
-                export_cfg=context.export,
-                openscad_bin=context.openscad_bin,
-                freecad_bin=context.freecad_bin,
-            )
-            step_paths.append(fallback.step_path)
-            assembly_plan.record["step"] = str(fallback.step_path)
-            if fallback.dedup_hit and fallback.cache_path:
+                step_paths.append(assembly_plan.step_path)
+                assembly_plan.record["step"] = str(assembly_plan.step_path)
                 logs.append(
-                    f"STEP linked to cached geometry {fallback.cache_path} -> {fallback.step_path}"
+                    f"STEP assembled from {len(parts)} panels -> {assembly_plan.step_path}"
+                )
+            except ExportError as exc:
+                logs.append(f"STEP assembly fallback via SCAD export ({exc})")
+                fallback = export_step_artifact(
+                    assembly_plan.scad_path,
+                    assembly_plan.step_path,
+                    export_cfg=context.export,
+                    openscad_bin=context.openscad_bin,
+                    freecad_bin=context.freecad_bin,
                 )
-            else:
-                logs.append(f"STEP written to {fallback.step_path}")
+                step_paths.append(fallback.step_path)
+                assembly_plan.record["step"] = str(fallback.step_path)
+                if fallback.dedup_hit and fallback.cache_path:
+                    logs.append(
+                        f"STEP linked to cached geometry {fallback.cache_path} -> {fallback.step_path}"
+                    )
+                else:
+                    logs.append(f"STEP written to {fallback.step_path}")
+
+        logs[png_log_index:png_log_index] = [
+            line for future in png_futures for line in future.result()
+        ]
 
     meta = {
         "model": "opengrid-beam_papierkorb",
@@ -466,7 +508,7 @@ def _connector_preview(panel_set: OpenGridPanelSet) -> List[RectPrismSpec]:
 class RenderedArtifact:
     artifact: LayoutArtifact
     placements: List[PanelPlacement]
-    scad_text: str
+    scad_path: Path
 
 
 def _render_artifacts_concurrently(
@@ -477,16 +519,39 @@ def _render_artifacts_concurrently(
     connector_opts: ConnectorOptions,
     includes: IncludePaths,
     include_preview_imports: bool,
+    out_dir: Path,
+    executor: str = "thread",
 ) -> list[RenderedArtifact]:
-    max_workers = max(1, min(32, os.cpu_count() or 1))
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    """Generate and write the SCAD file of every artifact.
+
+    Each worker writes its own file, so the writes overlap with the text
+    generation of the other artifacts and only paths travel back.
+
+    Text generation is pure Python and holds the GIL, so ``executor="process"``
+    (``export.scad_executor``) spreads large artifact batches over one worker
+    process per CPU. The default thread pool avoids the process start-up and
+    pickling cost, which dominates for the usual few dozen artifacts.
+    """
+    executor = executor.lower()
+    if executor not in {"thread", "process"}:
+        raise ExportError(f"unknown scad executor '{executor}' (expected 'thread' or 'process')")
+    if executor == "process":
+        pool = ProcessPoolExecutor(max_workers=max(1, min(len(inputs), os.cpu_count() or 1)))
+    else:
+        pool = ThreadPoolExecutor(max_workers=max(1, min(32, os.cpu_count() or 1)))
+    # Every non-connector artifact embeds the same panel modules, and deriving
+    # the beam configs compares all panel pairs, so build the text once.
+    panel_modules = None
+    if any(not artifact.is_connector_sheet for artifact, _ in inputs):
+        panel_modules = build_panel_modules(panel_set, board)
+    with pool as executor:
         futures = []
         for artifact, placements in inputs:
             connectors = connector_plan if artifact.is_connector_sheet else None
             connector_options = connector_opts if artifact.is_connector_sheet else None
             futures.append(
                 executor.submit(
-                    _build_artifact_scad_text,
+                    _write_artifact_scad,
                     artifact,
                     placements,
                     panel_set,
@@ -495,12 +560,14 @@ def _render_artifacts_concurrently(
                     connector_options,
                     includes,
                     include_preview_imports,
+                    out_dir / f"{artifact.basename}.scad",
+                    panel_modules,
                 )
             )
     return [future.result() for future in futures]
 
 
-def _build_artifact_scad_text(
+def _write_artifact_scad(
     artifact: LayoutArtifact,
     placements: list[PanelPlacement],
     panel_set: OpenGridPanelSet,
@@ -509,19 +576,23 @@ def _build_artifact_scad_text(
     connector_opts: ConnectorOptions | None,
     includes: IncludePaths,
     include_preview_imports: bool,
+    scad_path: Path,
+    panel_modules: str | None = None,
 ) -> RenderedArtifact:
-        scad_text = build_scad_for_artifact(
-            artifact_label=artifact.label,
-            placements=placements,
-            panel_set=panel_set,
-            board=board,
-            connectors=connectors,
-            connector_opts=connector_opts,
-            includes=includes,
-            include_preview_imports=include_preview_imports,
-            beam_mode=artifact.beam_mode,
-        )
-        return RenderedArtifact(artifact=artifact, placements=placements, scad_text=scad_text)
+    scad_text = build_scad_for_artifact(
+        artifact_label=artifact.label,
+        placements=placements,
+        panel_set=panel_set,
+        board=board,
+        connectors=connectors,
+        connector_opts=connector_opts,
+        includes=includes,
+        include_preview_imports=include_preview_imports,
+        beam_mode=artifact.beam_mode,
+        panel_modules=panel_modules,
+    )
+    write_scad(scad_path, scad_text)
+    return RenderedArtifact(artifact=artifact, placements=placements, scad_path=scad_path)
 
 
 @dataclass
@@ -530,23 +601,19 @@ class PNGExportTask:
     png_path: Path
     preview_prisms: List[RectPrismSpec]
     png_args: Sequence[str]
+    fast_preview: bool = False
 
 
-def _run_png_tasks_concurrently(tasks: List[PNGExportTask], openscad_bin: str | None) -> List[str]:
-    if not tasks:
-        return []
-    max_workers = max(1, min(16, os.cpu_count() or 1))
-    logs: List[str] = []
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(_run_single_png_task, task, openscad_bin) for task in tasks]
-        for future in futures:
-            logs.extend(future.result())
-    return logs
-
-
-def _run_single_png_task(task: PNGExportTask, openscad_bin: str | None) -> List[str]:
+def _run_single_png_task(
+    task: PNGExportTask,
+    openscad_bin: str | None,
+    cache: RenderCache | None = None,
+) -> List[str]:
+    if task.fast_preview:
+        render_isometric_preview(task.preview_prisms, task.png_path)
+        return [f"PNG preview rendered to {task.png_path}"]
     try:
-        run_openscad(task.scad_path, task.png_path, openscad_bin, task.png_args)
+        run_openscad(task.scad_path, task.png_path, openscad_bin, task.png_args, cache=cache)
     except ExportError as exc:
         render_isometric_preview(task.preview_prisms, task.png_path)
         return [f"PNG fallback rendered to {task.png_path} ({exc})"]
@@ -555,6 +622,12 @@ def _run_single_png_task(task: PNGExportTask, openscad_bin: str | None) -> List[
 
 
 def _resolve_includes(out_dir: Path) -> IncludePaths:
+    # A relative out_dir depends on the cwd, so memoize on the absolute path.
+    return _resolve_includes_for(os.path.abspath(out_dir))
+
+
+@lru_cache(maxsize=32)
+def _resolve_includes_for(out_dir: str) -> IncludePaths:
     bosl2 = REPO_ROOT / "third_party" / "BOSL2" / "std.scad"
     open_grid = REPO_ROOT / "third_party" / "QuackWorks" / "openGrid" / "openGrid.scad"
     open_grid_beam = REPO_ROOT / "third_party" / "QuackWorks" / "openGrid" / "openGrid-beam.scad"
@@ -569,7 +642,7 @@ def _resolve_includes(out_dir: Path) -> IncludePaths:
     )
 
 
-def _relpath(target: Path, base: Path) -> str:
+def _relpath(target: Path, base: Path | str) -> str:
     return os.path.relpath(target, base).replace("\\", "/")
 
 
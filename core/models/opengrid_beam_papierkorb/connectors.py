@@ -18,14 +18,28 @@ class ConnectorPlan:
 
 
 def plan_connectors(panel_set: OpenGridPanelSet, include_floor_edges: bool = True) -> ConnectorPlan:
-    length_cells_total = panel_set.length_chunks.total_cells
-    width_cells_total = panel_set.width_chunks.total_cells
-    height_cells_total = panel_set.height_chunks.total_cells
+    snap_count, corner_count = plan_connector_counts(
+        panel_set.length_chunks.total_cells,
+        panel_set.width_chunks.total_cells,
+        panel_set.height_chunks.total_cells,
+        len(panel_set.length_chunks.cells),
+        len(panel_set.width_chunks.cells),
+        len(panel_set.height_chunks.cells),
+        include_floor_edges,
+    )
+    return ConnectorPlan(snap_count=snap_count, corner_count=corner_count)
 
-    length_chunk_count = len(panel_set.length_chunks.cells)
-    width_chunk_count = len(panel_set.width_chunks.cells)
-    height_chunk_count = len(panel_set.height_chunks.cells)
 
+def plan_connector_counts(
+    length_cells_total: int,
+    width_cells_total: int,
+    height_cells_total: int,
+    length_chunk_count: int,
+    width_chunk_count: int,
+    height_chunk_count: int,
+    include_floor_edges: bool = True,
+) -> tuple[int, int]:
+    """Return ``(snap_count, corner_count)`` from plain cell/chunk counts."""
     # Coplanar seams running vertically (between columns)
     vertical_seams_len = max(length_chunk_count - 1, 0)
     vertical_seams_width = max(width_chunk_count - 1, 0)
@@ -37,8 +51,8 @@ def plan_connectors(panel_set: OpenGridPanelSet, include_floor_edges: bool = Tru
     snap_horizontal_width = 2 * horizontal_levels * width_cells_total
 
     # Floor seams between tiles
-    snap_floor_len = max(length_chunk_count - 1, 0) * width_cells_total
-    snap_floor_width = max(width_chunk_count - 1, 0) * length_cells_total
+    snap_floor_len = vertical_seams_len * width_cells_total
+    snap_floor_width = vertical_seams_width * length_cells_total
     snap_floor = snap_floor_len + snap_floor_width
 
     snap_total = snap_vertical + snap_horizontal_len + snap_horizontal_width + snap_floor
@@ -48,4 +62,4 @@ def plan_connectors(panel_set: OpenGridPanelSet, include_floor_edges: bool = Tru
         # Right-angle connectors along the floor perimeter (floor to wall seams)
         corner_count = 2 * length_cells_total + 2 * width_cells_total
 
-    return ConnectorPlan(snap_count=snap_total, corner_count=corner_count)
+    return snap_total, corner_count
@@ -38,7 +38,7 @@ PALETTE = [
 ]
 
 
-@dataclass
+@dataclass(frozen=True)
 class IncludePaths:
     bosl2: str
     open_grid: str
@@ -74,12 +74,20 @@ def build_scad_for_artifact(
     includes: IncludePaths,
     include_preview_imports: bool = True,
     beam_mode: BeamPlacementMode = BeamPlacementMode.PANEL_ONLY,
+    panel_modules: str | None = None,
 ) -> str:
+    """Return the SCAD text of one artifact.
+
+    ``panel_modules`` is the output of ``build_panel_modules`` for this
+    ``panel_set``/``board``; builds writing many artifacts compute it once and
+    pass it in.
+    """
     header = _build_header(includes, board)
     if artifact_label == "connectors":
         body = _connectors_body(connectors, board, connector_opts, includes.angle_connector)
         return f"{header}\n{body}\nconnectors_artifact();\n"
-    panel_modules = _panel_modules(panel_set, board)
+    if panel_modules is None:
+        panel_modules = build_panel_modules(panel_set, board)
     color_defs, color_map = _build_panel_color_modules(panel_set)
     placement_block = _placement_block(
         artifact_label,
@@ -141,7 +149,8 @@ def _build_header(includes: IncludePaths, board: BoardOptions) -> str:
     )
 
 
-def _panel_modules(panel_set: OpenGridPanelSet, board: BoardOptions) -> str:
+def build_panel_modules(panel_set: OpenGridPanelSet, board: BoardOptions) -> str:
+    """Panel and beam modules shared by every artifact of a build."""
     modules = []
     central_ids = _central_floor_panel_ids(panel_set)
     side_contacts, stacked = _build_side_contacts(panel_set.panels)
@@ -1,23 +1,28 @@
 from __future__ import annotations
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Mapping
 
 from ...engine import BuildContext, EngineResult
 from ...export import (
     ExportError,
+    RenderCache,
     StepAssemblyPart,
     StepExportTask,
     assemble_step_from_parts,
     build_png_args,
     export_step_artifacts_parallel,
+    openscad_backend_args,
     run_openscad,
 )
 from ...preview import RectPrismSpec, render_isometric_preview
 from ..papierkorb import layout as layout_builder
 from ..papierkorb.layout import LayoutConfig, PanelPlacement
+from ..papierkorb.scad_writer import write_scad
 from .connectors import ConnectorPlan, plan_connectors
 from .panels import OpenGridPanelSet, build_panels
 from .params import OpenGrid2Params
@@ -70,6 +75,7 @@ def build(context: BuildContext) -> EngineResult:
         raise ValueError("no layout artifacts produced; check layout.mode configuration")
 
     png_enabled, png_args = build_png_args(context.export.get("png"))
+    render_cache = RenderCache.from_config(context.export.get("render_cache"))
     assembly_mode = str(context.export.get("step_assembly", "panel") or "panel").lower()
     panel_assembly_enabled = assembly_mode == "panel"
     scad_primary: Path | None = None
@@ -100,7 +106,7 @@ def build(context: BuildContext) -> EngineResult:
                 board=params.board,
                 includes=includes,
             )
-            panel_scad_path.write_text(panel_scad_text, encoding="utf-8")
+            write_scad(panel_scad_path, panel_scad_text)
             panel_scad_paths[panel.panel_id] = panel_scad_path
             panel_step_path = context.out_dir / f"{panel.panel_id}_panel.step"
             step_tasks.append(
@@ -114,86 +120,112 @@ def build(context: BuildContext) -> EngineResult:
                 )
             )
 
-    for artifact in artifacts:
-        placements = list(artifact.placements)
-        scad_path = context.out_dir / f"{artifact.basename}.scad"
-        scad_text = build_scad_for_artifact(
-            artifact_label=artifact.label,
-            placements=placements,
-            panel_set=panel_set,
-            board=params.board,
-            connectors=connector_plan if artifact.is_connector_sheet else None,
-            connector_opts=params.connectors if artifact.is_connector_sheet else None,
-            includes=includes,
-            include_preview_imports=include_preview_imports,
-        )
-        scad_path.write_text(scad_text, encoding="utf-8")
-        if scad_primary is None:
-            scad_primary = scad_path
-        logs.append(f"SCAD written to {scad_path}")
-
-        artifact_stl: Path | None = None
-        artifact_png: Path | None = None
-
-        if context.export.get("stl"):
-            stl_path = context.out_dir / f"{artifact.basename}.stl"
-            run_openscad(scad_path, stl_path, context.openscad_bin)
-            stl_paths.append(stl_path)
-            logs.append(f"STL written to {stl_path}")
-            artifact_stl = stl_path
-
-        if context.export.get("step") and (artifact.label != "assembled" or not panel_assembly_enabled):
-            step_path = context.out_dir / f"{artifact.basename}.step"
-            export_cfg = context.export
-            if backend == "freecad_csg" and artifact.is_connector_sheet:
-                export_cfg = dict(context.export)
-                export_cfg["step_backend"] = "freecad"
-            step_tasks.append(
-                StepExportTask(
+    # OpenSCAD has no batch or server mode, so the STL renders are started
+    # concurrently as their SCAD files appear and joined before the STEP stage.
+    stl_futures = []
+    stl_args = openscad_backend_args(context.export, context.openscad_bin)
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(16, os.cpu_count() or 1)), thread_name_prefix="oscadforge-stl"
+    ) as stl_pool:
+        for artifact in artifacts:
+            placements = list(artifact.placements)
+            scad_path = context.out_dir / f"{artifact.basename}.scad"
+            scad_text = build_scad_for_artifact(
+                artifact_label=artifact.label,
+                placements=placements,
+                panel_set=panel_set,
+                board=params.board,
+                connectors=connector_plan if artifact.is_connector_sheet else None,
+                connector_opts=params.connectors if artifact.is_connector_sheet else None,
+                includes=includes,
+                include_preview_imports=include_preview_imports,
+            )
+            write_scad(scad_path, scad_text)
+            if scad_primary is None:
+                scad_primary = scad_path
+            logs.append(f"SCAD written to {scad_path}")
+
+            artifact_stl: Path | None = None
+            artifact_png: Path | None = None
+
+            if context.export.get("stl"):
+                stl_path = context.out_dir / f"{artifact.basename}.stl"
+                stl_futures.append(
+                    (
+                        stl_path,
+                        stl_pool.submit(
+                            run_openscad,
+                            scad_path,
+                            stl_path,
+                            context.openscad_bin,
+                            stl_args,
+                            cache=render_cache,
+                        ),
+                    )
+                )
+                stl_paths.append(stl_path)
+                artifact_stl = stl_path
+
+            if context.export.get("step") and (artifact.label != "assembled" or not panel_assembly_enabled):
+                step_path = context.out_dir / f"{artifact.basename}.step"
+                export_cfg = context.export
+                if backend == "freecad_csg" and artifact.is_connector_sheet:
+                    export_cfg = dict(context.export)
+                    export_cfg["step_backend"] = "freecad"
+                step_tasks.append(
+                    StepExportTask(
+                        scad_path=scad_path,
+                        step_path=step_path,
+                        export_cfg=export_cfg,
+                        openscad_bin=context.openscad_bin,
+                        freecad_bin=context.freecad_bin,
+                        stl_path=artifact_stl,
+                        metadata={
+                            "artifact_basename": artifact.basename,
+                            "artifact_label": artifact.label,
+                        },
+                    )
+                )
+
+            if png_enabled:
+                png_path = context.out_dir / f"{artifact.basename}.png"
+                if context.export.get("png_fast_preview"):
+                    render_isometric_preview(artifact.preview_prisms, png_path)
+                    logs.append(f"PNG preview rendered to {png_path}")
+                else:
+                    try:
+                        run_openscad(scad_path, png_path, context.openscad_bin, png_args, cache=render_cache)
+                    except ExportError as exc:
+                        render_isometric_preview(artifact.preview_prisms, png_path)
+                        logs.append(f"PNG fallback rendered to {png_path} ({exc})")
+                    else:
+                        logs.append(f"PNG written to {png_path}")
+                png_paths.append(png_path)
+                artifact_png = png_path
+
+            record = {
+                "label": artifact.label,
+                "basename": artifact.basename,
+                "scad": str(scad_path),
+                "stl": str(artifact_stl) if artifact_stl else None,
+                "step": None,
+                "png": str(artifact_png) if artifact_png else None,
+            }
+            artifact_records.append(record)
+            artifact_record_map[artifact.basename] = record
+
+            if artifact.label == "assembled" and panel_assembly_enabled:
+                assembly_plan = AssemblyPlan(
+                    placements=placements,
+                    step_path=context.out_dir / f"{artifact.basename}.step",
+                    record=record,
                     scad_path=scad_path,
-                    step_path=step_path,
-                    export_cfg=export_cfg,
-                    openscad_bin=context.openscad_bin,
-                    freecad_bin=context.freecad_bin,
-                    stl_path=artifact_stl,
-                    metadata={
-                        "artifact_basename": artifact.basename,
-                        "artifact_label": artifact.label,
-                    },
                 )
-            )
+                continue
 
-        if png_enabled:
-            png_path = context.out_dir / f"{artifact.basename}.png"
-            try:
-                run_openscad(scad_path, png_path, context.openscad_bin, png_args)
-            except ExportError as exc:
-                render_isometric_preview(artifact.preview_prisms, png_path)
-                logs.append(f"PNG fallback rendered to {png_path} ({exc})")
-            else:
-                logs.append(f"PNG written to {png_path}")
-            png_paths.append(png_path)
-            artifact_png = png_path
-
-        record = {
-            "label": artifact.label,
-            "basename": artifact.basename,
-            "scad": str(scad_path),
-            "stl": str(artifact_stl) if artifact_stl else None,
-            "step": None,
-            "png": str(artifact_png) if artifact_png else None,
-        }
-        artifact_records.append(record)
-        artifact_record_map[artifact.basename] = record
-
-        if artifact.label == "assembled" and panel_assembly_enabled:
-            assembly_plan = AssemblyPlan(
-                placements=placements,
-                step_path=context.out_dir / f"{artifact.basename}.step",
-                record=record,
-                scad_path=scad_path,
-            )
-            continue
+        for stl_path, future in stl_futures:
+            future.result()
+            logs.append(f"STL written to {stl_path}")
 
     if step_tasks:
         for task, step_result in export_step_artifacts_parallel(step_tasks):
@@ -217,8 +249,6 @@ def build(context: BuildContext) -> EngineResult:
 
     if assembly_plan and context.export.get("step") and panel_assembly_enabled:
         try:
-            if not context.freecad_bin:
-                raise ExportError("freecad binary not configured for assembly export")
             parts: List[StepAssemblyPart] = []
             missing_panels: List[str] = []
             for placement in assembly_plan.placements:
@@ -237,7 +267,12 @@ def build(context: BuildContext) -> EngineResult:
                 raise ExportError(
                     f"missing STEP panels for assembly: {', '.join(sorted(set(missing_panels)))}"
                 )
-            assemble_step_from_parts(parts, assembly_plan.step_path, context.freecad_bin)
+            assemble_step_from_parts(
+                parts,
+                assembly_plan.step_path,
+                context.freecad_bin,
+                backend=context.export.get("step_assembly_backend"),
+            )
             step_paths.append(assembly_plan.step_path)
             assembly_plan.record["step"] = str(assembly_plan.step_path)
             logs.append(
@@ -388,6 +423,12 @@ def _connector_preview(panel_set: OpenGridPanelSet) -> List[RectPrismSpec]:
 
 
 def _resolve_includes(out_dir: Path) -> IncludePaths:
+    # A relative out_dir depends on the cwd, so memoize on the absolute path.
+    return _resolve_includes_for(os.path.abspath(out_dir))
+
+
+@lru_cache(maxsize=32)
+def _resolve_includes_for(out_dir: str) -> IncludePaths:
     bosl2 = REPO_ROOT / "third_party" / "BOSL2" / "std.scad"
     open_grid = REPO_ROOT / "third_party" / "QuackWorks" / "openGrid" / "openGrid.scad"
     snap = REPO_ROOT / "third_party" / "QuackWorks" / "openGrid" / "opengrid-snap.scad"
@@ -400,7 +441,7 @@ def _resolve_includes(out_dir: Path) -> IncludePaths:
     )
 
 
-def _relpath(target: Path, base: Path) -> str:
+def _relpath(target: Path, base: Path | str) -> str:
     return os.path.relpath(target, base).replace("\\", "/")
 
 
@@ -26,7 +26,7 @@ PALETTE = [
 ]
 
 
-@dataclass
+@dataclass(frozen=True)
 class IncludePaths:
     bosl2: str
     open_grid: str
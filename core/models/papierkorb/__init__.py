@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import io
 import os
-from dataclasses import asdict, dataclass, fields
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
 
 import anchorscad as ad
 from anchorscad.renderer import render as render_shape
@@ -11,12 +14,18 @@ from anchorscad.renderer import render as render_shape
 from ...engine import BuildContext, EngineResult
 from ...export import (
     ExportError,
+    RenderCache,
     StepAssemblyPart,
+    StepDedupManager,
     StepExportTask,
     assemble_step_from_parts,
     build_png_args,
     export_step_artifacts_parallel,
+    lookup_cached_step,
+    openscad_backend_args,
+    openscad_workers,
     run_openscad,
+    scad_dependency_stamp,
 )
 from ...preview import RectPrismSpec, render_isometric_preview
 from . import layout as layout_builder
@@ -53,7 +62,9 @@ JL_SCAD_DIR = ROOT_DIR / "third_party" / "jl_scad"
 
 def build(context: BuildContext) -> EngineResult:
     params = PapierkorbParams.from_mapping(_filter_params(context.model_params))
-    layout_cfg = _extract_layout_cfg(context)
+    layout_section = _extract_layout_section(context)
+    layout_mode = _layout_mode(layout_section)
+    layout_cfg = _extract_layout_cfg(layout_section)
     assembly_mode = str(context.export.get("step_assembly", "panel") or "panel").lower()
     panel_set = None
     plan = None
@@ -64,7 +75,7 @@ def build(context: BuildContext) -> EngineResult:
                 label="assembled",
                 basename=context.basename,
                 placements=[],
-                preview_prisms=_assembled_preview_prisms(params),
+                preview_prisms=list(_assembled_preview_prisms(params)),
                 maker=shell_maker,
             )
         ]
@@ -72,7 +83,7 @@ def build(context: BuildContext) -> EngineResult:
     else:
         panel_set = panel_builder.build_panels(params)
         plan = layout_builder.build_layout(panel_set.panels, layout_cfg)
-        artifacts = _build_artifacts(plan, context, layout_cfg, params)
+        artifacts = _build_artifacts(plan, context, layout_cfg, params, layout_mode)
 
         sheet_count = len(plan.flat_sheets)
 
@@ -80,6 +91,7 @@ def build(context: BuildContext) -> EngineResult:
         raise ValueError("no layout artifacts produced; check layout.mode configuration")
 
     png_enabled, png_args = build_png_args(context.export.get("png"))
+    render_cache = RenderCache.from_config(context.export.get("render_cache"))
     panel_assembly_enabled = (
         assembly_mode == "panel"
         and panel_set is not None
@@ -95,64 +107,95 @@ def build(context: BuildContext) -> EngineResult:
     logs: List[str] = []
     artifact_records: List[Dict[str, Any]] = []
     artifact_record_map: Dict[str, Dict[str, Any]] = {}
+    # Every SCAD file lands in out_dir, so the include path is shared.
+    jl_scad_include = os.path.relpath(JL_SCAD_DIR, context.out_dir).replace("\\", "/")
 
     if panel_assembly_enabled and context.export.get("step") and panel_set is not None:
-        jl_include_root = os.path.relpath(JL_SCAD_DIR, context.out_dir)
-        seen_panels: set[str] = set()
-        for panel in panel_set.panels:
-            if panel.panel_id in seen_panels:
-                continue
-            seen_panels.add(panel.panel_id)
+        # One STEP per panel id; dict keeps first-seen order.
+        unique_panels = {panel.panel_id: panel for panel in panel_set.panels}
+        # Panel SCADs only include these; edits to jl_scad re-key every panel.
+        jl_scad_stamp = scad_dependency_stamp(
+            [JL_SCAD_DIR / "box.scad", JL_SCAD_DIR / "parts.scad"]
+        )
+        panel_writes: List[tuple[Path, str]] = []
+        # One dedup manager per backend for every panel lookup of this build.
+        dedup_managers: Dict[str, StepDedupManager] = {}
+        for panel in unique_panels.values():
             panel_scad_path = context.out_dir / f"{panel.panel_id}_panel.scad"
-            panel_scad_text = scad_writer.build_scad_for_panel(
+            fingerprint = scad_writer.panel_fingerprint(
                 params=params,
                 panel=panel,
-                jl_scad_path=jl_include_root,
+                jl_scad_path=jl_scad_include,
+                library_stamp=jl_scad_stamp,
             )
-            panel_scad_path.write_text(panel_scad_text, encoding="utf-8")
-            panel_step_path = panel_scad_path.with_suffix(".step")
-            step_tasks.append(
-                StepExportTask(
-                    scad_path=panel_scad_path,
-                    step_path=panel_step_path,
-                    export_cfg=context.export,
-                    openscad_bin=context.openscad_bin,
-                    freecad_bin=context.freecad_bin,
-                    metadata={"panel_step": True, "panel_id": panel.panel_id},
-                )
+            panel_task = StepExportTask(
+                scad_path=panel_scad_path,
+                step_path=panel_scad_path.with_suffix(".step"),
+                export_cfg=context.export,
+                openscad_bin=context.openscad_bin,
+                freecad_bin=context.freecad_bin,
+                metadata={"panel_step": True, "panel_id": panel.panel_id},
+                source_key=f"{context.out_dir.resolve()}:panel:{fingerprint}",
             )
-
-    for idx, artifact in enumerate(artifacts):
+            # With step_dedup on, a panel seen before links its cached STEP
+            # without generating (or rendering) its SCAD at all.
+            cached = lookup_cached_step(panel_task, dedup_managers)
+            if cached is not None:
+                panel_step_sources[panel.panel_id] = cached.step_path
+                logs.append(f"STEP panel {panel.panel_id} -> {cached.step_path} (cached)")
+                continue
+            panel_scad_text = scad_writer.build_scad_for_panel(
+                params=params,
+                panel=panel,
+                jl_scad_path=jl_scad_include,
+            )
+            panel_writes.append((panel_scad_path, panel_scad_text))
+            step_tasks.append(panel_task)
+        _write_scad_files(panel_writes)
+
+    # SCAD generation stays serial (cheap, deterministic); the OpenSCAD
+    # STL/PNG renders are collected as jobs and fanned out below.
+    render_jobs: List[OpenSCADJob] = []
+    artifact_logs: List[List[str]] = []
+    for artifact in artifacts:
         placements = list(artifact.placements)
         scad_path = context.out_dir / f"{artifact.basename}.scad"
         if artifact.maker is not None:
             render_result = render_shape(artifact.maker)
-            with scad_path.open("w", encoding="utf-8") as handle:
-                render_result.rendered_shape.dump(handle)
+            buffer = io.StringIO()
+            render_result.rendered_shape.dump(buffer)
+            scad_writer.write_scad(scad_path, buffer.getvalue())
         else:
             if panel_set is None:
                 raise ValueError("panel data unavailable for jl_scad artifact generation")
-            jl_scad_include = os.path.relpath(JL_SCAD_DIR, scad_path.parent)
             scad_text = scad_writer.build_scad_for_artifact(
                 params=params,
                 panel_result=panel_set,
                 artifact_label=artifact.label,
                 placements=placements,
-                jl_scad_path=jl_scad_include.replace("\\", "/"),
+                jl_scad_path=jl_scad_include,
             )
-            scad_path.write_text(scad_text, encoding="utf-8")
+            scad_writer.write_scad(scad_path, scad_text)
         if scad_primary is None:
             scad_primary = scad_path
-        logs.append(f"SCAD written to {scad_path}")
+        entry_logs = [f"SCAD written to {scad_path}"]
+        artifact_logs.append(entry_logs)
 
         artifact_stl: Path | None = None
         artifact_png: Path | None = None
 
         if context.export.get("stl"):
             stl_path = context.out_dir / f"{artifact.basename}.stl"
-            run_openscad(scad_path, stl_path, context.openscad_bin)
+            render_jobs.append(
+                OpenSCADJob(
+                    "stl",
+                    scad_path,
+                    stl_path,
+                    args=openscad_backend_args(context.export, context.openscad_bin),
+                    logs=entry_logs,
+                )
+            )
             stl_paths.append(stl_path)
-            logs.append(f"STL written to {stl_path}")
             artifact_stl = stl_path
 
         if context.export.get("step") and (artifact.label != "assembled" or not panel_assembly_enabled):
@@ -169,16 +212,18 @@ def build(context: BuildContext) -> EngineResult:
                 )
             )
 
-        preview_prisms = artifact.preview_prisms
         if png_enabled:
             png_path = context.out_dir / f"{artifact.basename}.png"
-            try:
-                run_openscad(scad_path, png_path, context.openscad_bin, png_args)
-            except ExportError as exc:
-                render_isometric_preview(preview_prisms, png_path)
-                logs.append(f"PNG fallback rendered to {png_path} ({exc})")
-            else:
-                logs.append(f"PNG written to {png_path}")
+            render_jobs.append(
+                OpenSCADJob(
+                    "preview" if context.export.get("png_fast_preview") else "png",
+                    scad_path,
+                    png_path,
+                    args=png_args,
+                    logs=entry_logs,
+                    preview_prisms=artifact.preview_prisms,
+                )
+            )
             png_paths.append(png_path)
             artifact_png = png_path
 
@@ -201,6 +246,10 @@ def build(context: BuildContext) -> EngineResult:
                 scad_path=scad_path,
             )
 
+    _run_openscad_jobs(render_jobs, context.openscad_bin, render_cache)
+    for entry_logs in artifact_logs:
+        logs.extend(entry_logs)
+
     if step_tasks:
         for task, step_result in export_step_artifacts_parallel(step_tasks):
             meta = task.metadata or {}
@@ -223,8 +272,6 @@ def build(context: BuildContext) -> EngineResult:
 
     if assembly_plan and panel_assembly_enabled and context.export.get("step"):
         try:
-            if not context.freecad_bin:
-                raise ExportError("freecad binary not configured for assembly export")
             parts: List[StepAssemblyPart] = []
             missing_panels: List[str] = []
             for placement in assembly_plan.placements:
@@ -243,7 +290,12 @@ def build(context: BuildContext) -> EngineResult:
                 raise ExportError(
                     f"missing STEP panels for assembly: {', '.join(sorted(set(missing_panels)))}"
                 )
-            assemble_step_from_parts(parts, assembly_plan.step_path, context.freecad_bin)
+            assemble_step_from_parts(
+                parts,
+                assembly_plan.step_path,
+                context.freecad_bin,
+                backend=context.export.get("step_assembly_backend"),
+            )
             step_paths.append(assembly_plan.step_path)
             assembly_plan.record["step"] = str(assembly_plan.step_path)
             logs.append(
@@ -271,7 +323,7 @@ def build(context: BuildContext) -> EngineResult:
         "params": asdict(params),
         "panel_count": len(panel_set.panels) if panel_set else 1,
         "layout": {
-            "mode": _layout_mode(_extract_layout_section(context)),
+            "mode": layout_mode,
             "bed_mm": list(layout_cfg.bed_size_mm),
             "spacing_mm": layout_cfg.spacing_mm,
             "sheet_count": sheet_count,
@@ -288,8 +340,67 @@ def build(context: BuildContext) -> EngineResult:
     )
 
 
+@dataclass
+class OpenSCADJob:
+    """One render of an artifact: STL, PNG with preview fallback, or preview only."""
+
+    kind: str
+    scad_path: Path
+    out_path: Path
+    args: Sequence[str] | None = None
+    logs: List[str] = field(default_factory=list)
+    preview_prisms: List[RectPrismSpec] | None = None
+
+
+def _write_scad_files(writes: Sequence[tuple[Path, str]]) -> None:
+    """Write many small SCAD files concurrently to overlap filesystem latency."""
+    if len(writes) <= 1:
+        for path, text in writes:
+            scad_writer.write_scad(path, text)
+        return
+    with ThreadPoolExecutor(max_workers=min(8, len(writes))) as executor:
+        futures = [
+            executor.submit(scad_writer.write_scad, path, text) for path, text in writes
+        ]
+    for future in futures:
+        future.result()
+
+
+def _run_openscad_jobs(
+    jobs: List[OpenSCADJob],
+    openscad_bin: str | None,
+    cache: RenderCache | None = None,
+) -> None:
+    if not jobs:
+        return
+    with ThreadPoolExecutor(max_workers=min(len(jobs), openscad_workers())) as executor:
+        futures = [executor.submit(_run_single_openscad_job, job, openscad_bin, cache) for job in jobs]
+    # Merge in submission order so every artifact logs STL before PNG.
+    for job, future in zip(jobs, futures):
+        job.logs.append(future.result())
+
+
+def _run_single_openscad_job(
+    job: OpenSCADJob,
+    openscad_bin: str | None,
+    cache: RenderCache | None = None,
+) -> str:
+    if job.kind == "stl":
+        run_openscad(job.scad_path, job.out_path, openscad_bin, job.args, cache=cache)
+        return f"STL written to {job.out_path}"
+    if job.kind == "preview":
+        render_isometric_preview(job.preview_prisms or [], job.out_path)
+        return f"PNG preview rendered to {job.out_path}"
+    try:
+        run_openscad(job.scad_path, job.out_path, openscad_bin, job.args, cache=cache)
+    except ExportError as exc:
+        render_isometric_preview(job.preview_prisms or [], job.out_path)
+        return f"PNG fallback rendered to {job.out_path} ({exc})"
+    return f"PNG written to {job.out_path}"
+
+
 def _filter_params(raw: Mapping[str, Any]) -> Dict[str, Any]:
-    return {k: raw[k] for k in raw if k in PARAM_FIELDS}
+    return {k: raw[k] for k in raw.keys() & PARAM_FIELDS}
 
 
 def _extract_layout_section(context: BuildContext) -> Mapping[str, Any]:
@@ -312,8 +423,7 @@ def _layout_mode(section: Mapping[str, Any]) -> str:
     return mode
 
 
-def _extract_layout_cfg(context: BuildContext) -> layout_builder.LayoutConfig:
-    section = _extract_layout_section(context)
+def _extract_layout_cfg(section: Mapping[str, Any]) -> layout_builder.LayoutConfig:
     bed = section.get("bed_mm", (200.0, 200.0))
     if isinstance(bed, (list, tuple)) and len(bed) == 2:
         bed_tuple = (float(bed[0]), float(bed[1]))
@@ -328,16 +438,15 @@ def _build_artifacts(
     context: BuildContext,
     cfg: layout_builder.LayoutConfig,
     params: PapierkorbParams,
+    mode: str,
 ) -> List[LayoutArtifact]:
-    section = _extract_layout_section(context)
-    mode = _layout_mode(section)
     artifacts: List[LayoutArtifact] = []
     basename = context.basename
     if mode == DEBUG_LAYOUT_MODE:
         artifacts.append(_build_debug_artifact(plan, context, cfg, params, basename))
         return artifacts
     if mode in ("assembled", "both"):
-        prisms = _assembled_preview_prisms(params)
+        prisms = list(_assembled_preview_prisms(params))
         artifacts.append(
             LayoutArtifact(
                 label="assembled",
@@ -360,8 +469,9 @@ def _build_artifacts(
     return artifacts
 
 
-def _assembled_preview_prisms(params: PapierkorbParams) -> List[RectPrismSpec]:
-    prisms: List[RectPrismSpec] = []
+@lru_cache(maxsize=32)
+def _assembled_preview_prisms(params: PapierkorbParams) -> Tuple[RectPrismSpec, ...]:
+    """Return the assembled-bin preview prisms; memoized since params are frozen."""
     L = params.length_mm
     B = params.width_mm
     H = params.height_mm
@@ -372,21 +482,13 @@ def _assembled_preview_prisms(params: PapierkorbParams) -> List[RectPrismSpec]:
     tile_y = B / Ny
 
     base_color = (120, 140, 200)
-    for ix in range(Nx):
-        for iy in range(Ny):
-            x0 = -L / 2.0 + ix * tile_x
-            y0 = -B / 2.0 + iy * tile_y
-            prisms.append(
-                RectPrismSpec(
-                    x0,
-                    y0,
-                    0.0,
-                    x0 + tile_x,
-                    y0 + tile_y,
-                    wall,
-                    base_color,
-                )
-            )
+    xs = [(-L / 2.0 + ix * tile_x, -L / 2.0 + ix * tile_x + tile_x) for ix in range(Nx)]
+    ys = [(-B / 2.0 + iy * tile_y, -B / 2.0 + iy * tile_y + tile_y) for iy in range(Ny)]
+    prisms: List[RectPrismSpec] = [
+        RectPrismSpec(x0, y0, 0.0, x1, y1, wall, base_color)
+        for x0, x1 in xs
+        for y0, y1 in ys
+    ]
 
     wall_color = (80, 90, 110)
     prisms.append(RectPrismSpec(-L / 2.0, B / 2.0 - wall, 0.0, L / 2.0, B / 2.0, H, wall_color))
@@ -402,7 +504,7 @@ def _assembled_preview_prisms(params: PapierkorbParams) -> List[RectPrismSpec]:
         prisms.append(RectPrismSpec(-L / 2.0, -B / 2.0, H - rim_h, L / 2.0, -B / 2.0 + rim_w, H, rim_color))
         prisms.append(RectPrismSpec(L / 2.0 - rim_w, -B / 2.0, H - rim_h, L / 2.0, B / 2.0, H, rim_color))
         prisms.append(RectPrismSpec(-L / 2.0, -B / 2.0, H - rim_h, -L / 2.0 + rim_w, B / 2.0, H, rim_color))
-    return prisms
+    return tuple(prisms)
 
 
 def _build_debug_artifact(
@@ -418,8 +520,9 @@ def _build_debug_artifact(
     if shifted_flat:
         flat_maker = panel_render.build_maker(shifted_flat, layout_label="debug_panels")
         assembled_maker.add(flat_maker)
-    prisms = _assembled_preview_prisms(params)
-    prisms.extend(_flat_preview_prisms_shifted(plan.flat_sheets, offset_x))
+    prisms = list(_assembled_preview_prisms(params))
+    for sheet in plan.flat_sheets:
+        prisms.extend(_flat_preview_prisms(sheet, offset_x))
     return LayoutArtifact(
         label=DEBUG_LAYOUT_MODE,
         basename=f"{basename}_debug",
@@ -429,13 +532,15 @@ def _build_debug_artifact(
     )
 
 
-def _flat_preview_prisms(sheet: layout_builder.FlatSheet) -> List[RectPrismSpec]:
+def _flat_preview_prisms(
+    sheet: layout_builder.FlatSheet, offset_x: float = 0.0
+) -> List[RectPrismSpec]:
     prisms: List[RectPrismSpec] = []
     for placement in sheet.placements:
         panel = placement.panel
         centre = placement.origin
-        x0 = centre.x - panel.width / 2.0
-        x1 = centre.x + panel.width / 2.0
+        x0 = centre.x - panel.width / 2.0 + offset_x
+        x1 = centre.x + panel.width / 2.0 + offset_x
         y0 = centre.y - panel.height / 2.0
         y1 = centre.y + panel.height / 2.0
         z0 = 0.0
@@ -444,26 +549,6 @@ def _flat_preview_prisms(sheet: layout_builder.FlatSheet) -> List[RectPrismSpec]
     return prisms
 
 
-def _flat_preview_prisms_shifted(
-    sheets: List[layout_builder.FlatSheet], offset_x: float
-) -> List[RectPrismSpec]:
-    prisms: List[RectPrismSpec] = []
-    for sheet in sheets:
-        for base in _flat_preview_prisms(sheet):
-            prisms.append(
-                RectPrismSpec(
-                    base.x0 + offset_x,
-                    base.y0,
-                    base.z0,
-                    base.x1 + offset_x,
-                    base.y1,
-                    base.z1,
-                    base.color,
-                )
-            )
-    return prisms
-
-
 def _shift_flat_placements(
     sheets: List[layout_builder.FlatSheet], offset_x: float
 ) -> List[layout_builder.PanelPlacement]:
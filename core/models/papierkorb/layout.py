@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from operator import itemgetter
 from typing import Iterable, List, Sequence, Tuple
 
 from .panels import Panel, PanelAxes, AxisDirection, PanelKind, Vec3
@@ -48,72 +49,84 @@ def build_layout(panels: Sequence[Panel], cfg: LayoutConfig) -> LayoutPlan:
 def _build_flat_sheets(panels: Sequence[Panel], cfg: LayoutConfig) -> List[FlatSheet]:
     width, height = cfg.bed_size_mm
     spacing = max(0.0, cfg.spacing_mm)
-    ordered = sorted(panels, key=lambda p: (p.kind.value, -p.width * p.height))
+    # Decorate once: the sort key and the packing loop share width/height.
+    ordered = [(p.kind.value, -p.width * p.height, p.width, p.height, p) for p in panels]
+    ordered.sort(key=itemgetter(0, 1))
+    slots = _shelf_pack([(w, h) for _, _, w, h, _ in ordered], width, height, spacing)
+
     sheets: List[FlatSheet] = []
     current: List[PanelPlacement] = []
-    sheet_idx = 1
+    for (_, _, panel_w, panel_h, panel), (sheet_no, cursor_x, cursor_y) in zip(ordered, slots):
+        if current and sheet_no != len(sheets) + 1:
+            sheets.append(_flat_sheet(len(sheets) + 1, width, height, current))
+            current = []
+        centre_x = cursor_x + panel_w / 2.0
+        centre_y = cursor_y + panel_h / 2.0
+        origin = Vec3(centre_x - width / 2.0, centre_y - height / 2.0, panel.thickness / 2.0)
+        current.append(
+            PanelPlacement(
+                panel=panel,
+                origin=origin,
+                axes=_flat_axes_for(panel.kind),
+                sheet=f"sheet{sheet_no:02d}",
+            )
+        )
+    if current:
+        sheets.append(_flat_sheet(len(sheets) + 1, width, height, current))
+    return sheets
+
+
+def _shelf_pack(
+    sizes: Sequence[Tuple[float, float]], bed_w: float, bed_h: float, spacing: float
+) -> List[Tuple[int, float, float]]:
+    """Shelf-pack ``(w, h)`` rects; return ``(sheet number, x, y)`` min corners.
+
+    Pure float arithmetic on plain tuples, kept apart from the Panel objects so
+    the hot loop does no attribute lookups.
+    """
+    slots: List[Tuple[int, float, float]] = []
+    sheet_no = 1
+    on_sheet = 0
     cursor_x = spacing
     cursor_y = spacing
     row_height = 0.0
-
-    def new_sheet() -> None:
-        nonlocal cursor_x, cursor_y, row_height, current, sheet_idx
-        if current:
-            label = _sheet_module_label(current)
-            sheets.append(
-                FlatSheet(
-                    name=f"sheet{sheet_idx:02d}",
-                    width=width,
-                    height=height,
-                    placements=current,
-                    module_label=label,
-                )
-            )
-            sheet_idx += 1
-        current = []
-        cursor_x = spacing
-        cursor_y = spacing
-        row_height = 0.0
-
-    new_sheet()
-    for panel in ordered:
-        panel_w = panel.width
-        panel_h = panel.height
-        if cursor_x + panel_w + spacing > width:
+    for panel_w, panel_h in sizes:
+        if cursor_x + panel_w + spacing > bed_w:
             cursor_x = spacing
             cursor_y += row_height + spacing
             row_height = 0.0
-        if cursor_y + panel_h + spacing > height and current:
-            new_sheet()
-        centre_x = cursor_x + panel_w / 2.0
-        centre_y = cursor_y + panel_h / 2.0
-        origin = Vec3(centre_x - width / 2.0, centre_y - height / 2.0, panel.thickness / 2.0)
-        placement = PanelPlacement(
-            panel=panel,
-            origin=origin,
-            axes=_flat_axes_for(panel.kind),
-            sheet=f"sheet{sheet_idx:02d}",
-        )
-        current.append(placement)
+        if cursor_y + panel_h + spacing > bed_h and on_sheet:
+            sheet_no += 1
+            on_sheet = 0
+            cursor_x = spacing
+            cursor_y = spacing
+            row_height = 0.0
+        slots.append((sheet_no, cursor_x, cursor_y))
+        on_sheet += 1
         cursor_x += panel_w + spacing
-        row_height = max(row_height, panel_h)
-    if current:
-        label = _sheet_module_label(current)
-        sheets.append(
-            FlatSheet(
-                name=f"sheet{sheet_idx:02d}",
-                width=width,
-                height=height,
-                placements=current,
-                module_label=label,
-            )
-        )
-    return sheets
+        if panel_h > row_height:
+            row_height = panel_h
+    return slots
+
+
+def _flat_sheet(
+    sheet_no: int, width: float, height: float, placements: List[PanelPlacement]
+) -> FlatSheet:
+    return FlatSheet(
+        name=f"sheet{sheet_no:02d}",
+        width=width,
+        height=height,
+        placements=placements,
+        module_label=_sheet_module_label(placements),
+    )
+
+
+_FLAT_AXES = PanelAxes(AxisDirection("x"), AxisDirection("y"), AxisDirection("z"))
 
 
 def _flat_axes_for(kind: PanelKind) -> PanelAxes:
     # All panels lie flat on the bed; u->X, v->Y, w->Z.
-    return PanelAxes(AxisDirection("x"), AxisDirection("y"), AxisDirection("z"))
+    return _FLAT_AXES
 
 
 def _sheet_module_label(placements: List[PanelPlacement]) -> str | None:
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Mapping, Tuple
 
 
-@dataclass
+@dataclass(frozen=True)
 class PapierkorbParams:
     length_mm: float = 514.0
     width_mm: float = 170.0
@@ -28,18 +29,24 @@ class PapierkorbParams:
 
     def tile_counts(self) -> Tuple[int, int, int]:
         """Return tile count along X/Y/Z axes (Nx, Ny, Nz)."""
-        Nx = max(1, int((self.length_mm + self.max_tile_mm - 1) // self.max_tile_mm))
-        Ny = max(1, int((self.width_mm + self.max_tile_mm - 1) // self.max_tile_mm))
-        Nz = max(1, int((self.height_mm + self.max_tile_mm - 1) // self.max_tile_mm))
-        if not self.enable_tiles:
-            Nx = 1
-            Ny = 1
-        return Nx, Ny, Nz
+        return _tile_counts(
+            self.length_mm, self.width_mm, self.height_mm, self.max_tile_mm, self.enable_tiles
+        )
 
     @classmethod
     def from_mapping(cls, data: Mapping[str, object]) -> "PapierkorbParams":
-        kwargs = {}
-        for field in cls.__dataclass_fields__:  # type: ignore[attr-defined]
-            if field in data:
-                kwargs[field] = data[field]
-        return cls(**kwargs)
+        fields = cls.__dataclass_fields__.keys() & data.keys()  # type: ignore[attr-defined]
+        return cls(**{field: data[field] for field in fields})
+
+
+@lru_cache(maxsize=64)
+def _tile_counts(
+    length_mm: float, width_mm: float, height_mm: float, max_tile_mm: float, enable_tiles: bool
+) -> Tuple[int, int, int]:
+    Nx = max(1, int((length_mm + max_tile_mm - 1) // max_tile_mm))
+    Ny = max(1, int((width_mm + max_tile_mm - 1) // max_tile_mm))
+    Nz = max(1, int((height_mm + max_tile_mm - 1) // max_tile_mm))
+    if not enable_tiles:
+        Nx = 1
+        Ny = 1
+    return Nx, Ny, Nz
@@ -1,15 +1,47 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Iterable, List, Tuple
 
 import anchorscad as ad
 
 from .layout import PanelPlacement
-from .panels import AxisDirection, Panel, PanelFeature, Vec3
+from .panels import AxisDirection, Panel, PanelAxes, PanelFeature, Vec3
 
 EPS = 1.0e-3
 
+_AXIS_ROTATIONS = {
+    ("x", 1): ad.ROTY_90,
+    ("x", -1): ad.ROTY_270,
+    ("y", 1): ad.ROTX_270,
+    ("y", -1): ad.ROTX_90,
+    ("z", 1): None,
+    ("z", -1): ad.ROTX_180,
+}
+
+
+@dataclass(frozen=True)
+class AxesTransform:
+    """Local (u, v, w) -> world mapping resolved once per distinct PanelAxes."""
+
+    u: Vec3
+    v: Vec3
+    w: Vec3
+    # For world x/y/z: index into (size_u, size_v, size_w), or None.
+    size_index: Tuple[int | None, int | None, int | None]
+
+
+@lru_cache(maxsize=None)
+def _axes_transform(axes: PanelAxes) -> AxesTransform:
+    lookup = {axes.u.axis: 0, axes.v.axis: 1, axes.w.axis: 2}
+    return AxesTransform(
+        u=axes.u.vector(),
+        v=axes.v.vector(),
+        w=axes.w.vector(),
+        size_index=(lookup.get("x"), lookup.get("y"), lookup.get("z")),
+    )
+
 
 def centre_to_post(size_z: float, centre_z: float) -> float:
     """
@@ -33,13 +65,14 @@ def build_maker(placements: Iterable[PanelPlacement], *, layout_label: str) -> a
 
     for placement in placements:
         panel_colour = placement.panel.colour
+        transform = _axes_transform(placement.axes)
         for feature in placement.panel.features:
             name = _feature_name(feature, placement, layout_label)
             if feature.feature_type == "box":
-                shape = _box_shape(placement, feature, name, panel_colour)
+                shape = _box_shape(placement, transform, feature, name, panel_colour)
                 add_shape(shape)
             else:
-                shape = _cylinder_shape(placement, feature, name, panel_colour)
+                shape = _cylinder_shape(placement, transform, feature, name, panel_colour)
                 add_shape(shape)
     assert maker is not None, "at least one panel feature required"
     return maker
@@ -53,12 +86,13 @@ def _feature_name(feature: PanelFeature, placement: PanelPlacement, layout_label
 
 def _box_shape(
     placement: PanelPlacement,
+    transform: AxesTransform,
     feature: PanelFeature,
     name: str,
     colour: ad.Colour | None,
 ) -> ad.Maker:
-    size_x, size_y, size_z = _box_sizes_world(placement, feature)
-    offset = _offset_world(placement, feature)
+    size_x, size_y, size_z = _box_sizes_world(transform, feature)
+    offset = _offset_world(transform, feature)
     centre = placement.origin + offset
     post = ad.translate([centre.x, centre.y, centre_to_post(size_z, centre.z)])
     shape = ad.Box((size_x, size_y, size_z))
@@ -70,13 +104,14 @@ def _box_shape(
 
 def _cylinder_shape(
     placement: PanelPlacement,
+    transform: AxesTransform,
     feature: PanelFeature,
     name: str,
     colour: ad.Colour | None,
 ) -> ad.Maker:
     axis_dir = placement.axes.axis_for(feature.axis)
     rotation = _rotation_to_axis(axis_dir)
-    offset = _offset_world(placement, feature)
+    offset = _offset_world(transform, feature)
     centre = placement.origin + offset
     size_z = _cylinder_extent_z(axis_dir, feature)
     post = ad.translate([centre.x, centre.y, centre_to_post(size_z, centre.z)])
@@ -89,20 +124,20 @@ def _cylinder_shape(
     return named.at("centre", post=post)
 
 
-def _box_sizes_world(placement: PanelPlacement, feature: PanelFeature) -> Tuple[float, float, float]:
-    axes = placement.axes
-    size_map = {
-        axes.u.axis: feature.size_u,
-        axes.v.axis: feature.size_v,
-        axes.w.axis: feature.size_w,
-    }
-    return (size_map.get("x", 0.0), size_map.get("y", 0.0), size_map.get("z", 0.0))
+def _box_sizes_world(transform: AxesTransform, feature: PanelFeature) -> Tuple[float, float, float]:
+    sizes = (feature.size_u, feature.size_v, feature.size_w)
+    ix, iy, iz = transform.size_index
+    return (
+        sizes[ix] if ix is not None else 0.0,
+        sizes[iy] if iy is not None else 0.0,
+        sizes[iz] if iz is not None else 0.0,
+    )
 
 
-def _offset_world(placement: PanelPlacement, feature: PanelFeature) -> Vec3:
-    u_vec = placement.axes.u.vector()
-    v_vec = placement.axes.v.vector()
-    w_vec = placement.axes.w.vector()
+def _offset_world(transform: AxesTransform, feature: PanelFeature) -> Vec3:
+    u_vec = transform.u
+    v_vec = transform.v
+    w_vec = transform.w
     return Vec3(
         feature.offset_u * u_vec.x + feature.offset_v * v_vec.x + feature.offset_w * w_vec.x,
         feature.offset_u * u_vec.y + feature.offset_v * v_vec.y + feature.offset_w * w_vec.y,
@@ -111,15 +146,7 @@ def _offset_world(placement: PanelPlacement, feature: PanelFeature) -> Vec3:
 
 
 def _rotation_to_axis(axis: AxisDirection) -> ad.GMatrix | None:
-    mapping = {
-        ("x", 1): ad.ROTY_90,
-        ("x", -1): ad.ROTY_270,
-        ("y", 1): ad.ROTX_270,
-        ("y", -1): ad.ROTX_90,
-        ("z", 1): None,
-        ("z", -1): ad.ROTX_180,
-    }
-    return mapping[(axis.axis, axis.sign)]
+    return _AXIS_ROTATIONS[(axis.axis, axis.sign)]
 
 
 def _cylinder_extent_z(axis: AxisDirection, feature: PanelFeature) -> float:
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import hashlib
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Iterable, List, Sequence, Tuple
 
 from .layout import PanelPlacement
@@ -8,6 +10,8 @@ from .panels import Panel, PanelFeature, PanelGrid, PanelKind, PanelBuildResult
 from .params import PapierkorbParams
 
 EPS = 0.01
+# Generated SCAD changes whenever this module does; fold it into fingerprints.
+_WRITER_DIGEST = hashlib.blake2b(Path(__file__).read_bytes(), digest_size=8).digest()
 
 
 @dataclass
@@ -17,6 +21,22 @@ class PanelModule:
     geom_module: str
 
 
+def write_scad(path: Path, text: str) -> bool:
+    """Encode once and write the bytes in a single buffered call.
+
+    Files that already hold exactly these bytes are left untouched, so
+    rebuilds keep their mtimes. Returns whether the file was written.
+    """
+    data = text.encode("utf-8")
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
 def build_scad_for_artifact(
     *,
     params: PapierkorbParams,
@@ -57,6 +77,36 @@ def build_scad_for_panel(
     )
 
 
+def panel_fingerprint(
+    *, params: PapierkorbParams, panel: Panel, jl_scad_path: str, library_stamp: str
+) -> str:
+    """Cheap digest of everything build_scad_for_panel reads (colour is unused).
+
+    ``library_stamp`` stands in for the jl_scad sources the panel includes.
+    """
+    h = hashlib.blake2b(_WRITER_DIGEST, digest_size=16)
+    h.update(repr(params).encode("utf-8"))
+    h.update(jl_scad_path.encode("utf-8"))
+    h.update(library_stamp.encode("utf-8"))
+    h.update(
+        repr(
+            (
+                panel.panel_id,
+                panel.kind,
+                panel.width,
+                panel.height,
+                panel.thickness,
+                panel.origin,
+                panel.axes,
+                panel.bounds,
+                panel.indices,
+                panel.features,
+            )
+        ).encode("utf-8")
+    )
+    return h.hexdigest()
+
+
 def _scad_header(jl_scad_path: str) -> str:
     return f"""// Generated via oscadforge Papierkorb jl_scad backend
 include <{jl_scad_path}/box.scad>;
@@ -104,11 +104,7 @@ def build_simple_shell(params: PapierkorbParams) -> ad.Maker:
             )
         )
 
-    maker: ad.Maker | None = None
-    for body in bodies:
-        if maker is None:
-            maker = body
-        else:
-            maker.add(body)
-    assert maker is not None
+    maker = bodies[0]
+    for body in bodies[1:]:
+        maker.add(body)
     return maker
@@ -1,18 +1,29 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import math
 from dataclasses import fields
 from pathlib import Path
-from typing import Any, Iterable, Mapping
+from typing import Any, Mapping
 
 import anchorscad as ad
 from anchorscad.renderer import render as render_shape
 
 from ..engine import BuildContext, EngineResult
-from ..export import ExportError, build_png_args, export_step_artifact, run_openscad
+from ..export import (
+    ExportError,
+    RenderCache,
+    build_png_args,
+    export_step_artifact,
+    openscad_backend_args,
+    run_openscad,
+)
 from ..preview import RectSpec, render_rect_preview
 
 EPS = 1.0e-3
+# The emitted SCAD changes whenever this module does; fold it into the params key.
+_MODULE_DIGEST = hashlib.blake2b(Path(__file__).read_bytes(), digest_size=8).digest()
 
 
 @ad.shape
@@ -48,14 +59,7 @@ class SolarBusAssembly(ad.CompositeShape):
     cable_height_mm: float = ad.dtfield(10.0, "Cable trunk height")
 
     def build(self) -> ad.Maker:
-        maker = None
-
-        def add(shape_maker: ad.Maker):
-            nonlocal maker
-            if maker is None:
-                maker = shape_maker
-            else:
-                maker.add(shape_maker)
+        bodies: list[ad.Maker] = []
 
         def roof_z() -> float:
             return self.roof_thickness_mm / 2.0
@@ -65,7 +69,7 @@ class SolarBusAssembly(ad.CompositeShape):
             .solid("roof")
             .at("centre", post=ad.translate([0.0, 0.0, roof_z()]))
         )
-        add(roof)
+        bodies.append(roof)
 
         panel_centers = self._panel_centers()
         panel_z = self.roof_thickness_mm + (self.mounting_height_mm if self.mounting_show else 0.0)
@@ -83,7 +87,7 @@ class SolarBusAssembly(ad.CompositeShape):
                 .solid(f"panel_{idx}")
                 .at("centre", post=ad.translate([px, py, panel_centre_z]))
             )
-            add(panel)
+            bodies.append(panel)
 
         if self.mounting_show and panel_centers:
             rail_length = self.bus_length_mm - 2 * self.margin_edge_mm
@@ -100,24 +104,26 @@ class SolarBusAssembly(ad.CompositeShape):
                         post=ad.translate([0.0, row_y, rail_z]),
                     )
                 )
-                add(rail)
+                bodies.append(rail)
 
         if self.battery_count > 0 and self.battery_height_mm > 0:
             battery_positions = self._battery_centers()
             z_bat = -self.battery_clearance_mm - self.battery_height_mm / 2.0
+            # Batteries hang free below the roof; only pad them when they touch it.
+            battery_pad = EPS if self.battery_clearance_mm <= 0 else 0.0
             for idx, (bx, by) in enumerate(battery_positions):
                 battery = (
                     ad.Box(
                         (
                             self.battery_length_mm,
                             self.battery_width_mm,
-                            self.battery_height_mm + EPS,
+                            self.battery_height_mm + battery_pad,
                         )
                     )
                     .solid(f"battery_{idx}")
                     .at("centre", post=ad.translate([bx, by, z_bat]))
                 )
-                add(battery)
+                bodies.append(battery)
 
         if self.cable_show and panel_centers:
             entry = self._entry_point()
@@ -130,12 +136,26 @@ class SolarBusAssembly(ad.CompositeShape):
                 .solid("cable_trunk")
                 .at("centre", post=ad.translate([cable_start_x, cable_y, cable_z]))
             )
-            add(cable)
+            bodies.append(cable)
 
-        assert maker is not None, "SolarBusAssembly should have at least the roof"
+        # The roof is always present and anchors every other body.
+        maker = bodies[0]
+        for body in bodies[1:]:
+            maker.add(body)
         return maker
 
+    def _memo(self, key: str, compute):
+        # build() and the PNG fallback both need the layout; datatree fields are
+        # fixed after construction, so compute each derived value once.
+        cache = self.__dict__.setdefault("_derived_cache", {})
+        if key not in cache:
+            cache[key] = compute()
+        return cache[key]
+
     def _panel_centers(self) -> list[tuple[float, float]]:
+        return self._memo("panel_centers", self._compute_panel_centers)
+
+    def _compute_panel_centers(self) -> list[tuple[float, float]]:
         if self.panel_count <= 0:
             return []
         usable_length = self.bus_length_mm - 2 * self.margin_edge_mm
@@ -166,14 +186,12 @@ class SolarBusAssembly(ad.CompositeShape):
         leftover_y = max(usable_width - total_width, 0.0)
         start_y = -self.bus_width_mm / 2.0 + self.margin_edge_mm + self.panel_width_mm / 2.0 + leftover_y / 2.0
 
-        centers = []
-        for idx in range(self.panel_count):
-            row = idx // cols
-            col = idx % cols
-            x = start_x + col * (self.panel_length_mm + self.panel_gap_mm)
-            y = start_y + row * (self.panel_width_mm + self.panel_gap_mm)
-            centers.append((x, y))
-        return centers
+        pitch_x = self.panel_length_mm + self.panel_gap_mm
+        pitch_y = self.panel_width_mm + self.panel_gap_mm
+        xs = [start_x + col * pitch_x for col in range(cols)]
+        ys = [start_y + row * pitch_y for row in range(rows)]
+        # Row-major fill; the last row may be partial.
+        return [(x, y) for y in ys for x in xs][: self.panel_count]
 
     def _max_columns(self, usable_length: float) -> int:
         if self.panel_length_mm <= 0:
@@ -183,20 +201,22 @@ class SolarBusAssembly(ad.CompositeShape):
         return max(1, int(usable_length // (self.panel_length_mm + EPS)))
 
     def _battery_centers(self) -> list[tuple[float, float]]:
-        centers = []
+        return self._memo("battery_centers", self._compute_battery_centers)
+
+    def _compute_battery_centers(self) -> list[tuple[float, float]]:
         if self.battery_count <= 0:
-            return centers
+            return []
         usable_width = self.bus_width_mm - 2 * self.margin_edge_mm
         stride = self.battery_width_mm + self.battery_spacing_mm
         total_width = self.battery_count * self.battery_width_mm + max(self.battery_count - 1, 0) * self.battery_spacing_mm
         offset_y = max((usable_width - total_width) / 2.0, 0.0)
         start_y = -self.bus_width_mm / 2.0 + self.margin_edge_mm + self.battery_width_mm / 2.0 + offset_y
-        for idx in range(self.battery_count):
-            y = start_y + idx * stride
-            centers.append((self.battery_offset_x_mm, y))
-        return centers
+        return [(self.battery_offset_x_mm, start_y + idx * stride) for idx in range(self.battery_count)]
 
     def _entry_point(self) -> tuple[float, float]:
+        return self._memo("entry_point", self._compute_entry_point)
+
+    def _compute_entry_point(self) -> tuple[float, float]:
         x = -self.bus_length_mm / 2.0 + self.margin_edge_mm
         y = self.bus_width_mm / 2.0 - self.margin_edge_mm
         mapping = {
@@ -208,15 +228,7 @@ class SolarBusAssembly(ad.CompositeShape):
         return mapping.get(self.cable_entry, (x, y))
 
 
-def _allowed_fields() -> set[str]:
-    return {f.name for f in fields(SolarBusAssembly)}
-
-
-def _flatten(seq: Iterable[Any]) -> list[Any]:
-    return list(seq)
-
-
-ALLOWED_PARAMS = _allowed_fields()
+ALLOWED_PARAMS = frozenset(f.name for f in fields(SolarBusAssembly))
 
 
 def _shape_kwargs(context: BuildContext) -> dict[str, Any]:
@@ -226,23 +238,25 @@ def _shape_kwargs(context: BuildContext) -> dict[str, Any]:
     battery_cfg = cfg.get("battery", {})
     mounting_cfg = cfg.get("mounting", {})
     wiring_cfg = cfg.get("wiring", {})
+    panel_size = panels_cfg.get("size_mm") or (1200, 540, 35)
+    battery_size = battery_cfg.get("size_mm") or (330, 170, 220)
 
     defaults = {
         "bus_length_mm": bus_cfg.get("length_mm"),
         "bus_width_mm": bus_cfg.get("width_mm"),
         "margin_edge_mm": bus_cfg.get("margin_edge_mm"),
         "panel_count": panels_cfg.get("count"),
-        "panel_length_mm": _flatten(panels_cfg.get("size_mm", [1200, 540, 35]))[0],
-        "panel_width_mm": _flatten(panels_cfg.get("size_mm", [1200, 540, 35]))[1],
-        "panel_height_mm": _flatten(panels_cfg.get("size_mm", [1200, 540, 35]))[2],
+        "panel_length_mm": panel_size[0],
+        "panel_width_mm": panel_size[1],
+        "panel_height_mm": panel_size[2],
         "panel_tilt_deg": panels_cfg.get("tilt_deg"),
         "panel_gap_mm": panels_cfg.get("gap_mm"),
         "mounting_show": mounting_cfg.get("show_mounting"),
         "mounting_height_mm": mounting_cfg.get("rail_height_mm"),
         "battery_count": battery_cfg.get("count"),
-        "battery_length_mm": _flatten(battery_cfg.get("size_mm", [330, 170, 220]))[0],
-        "battery_width_mm": _flatten(battery_cfg.get("size_mm", [330, 170, 220]))[1],
-        "battery_height_mm": _flatten(battery_cfg.get("size_mm", [330, 170, 220]))[2],
+        "battery_length_mm": battery_size[0],
+        "battery_width_mm": battery_size[1],
+        "battery_height_mm": battery_size[2],
         "battery_offset_x_mm": (battery_cfg.get("custom_pos_mm") or [0, 0, 0])[0],
         "battery_spacing_mm": battery_cfg.get("spacing_mm"),
         "battery_clearance_mm": battery_cfg.get("floor_drop_mm"),
@@ -325,31 +339,96 @@ def _solar_preview_rects_from_shape(shape: SolarBusAssembly) -> list[RectSpec]:
     return rects
 
 
+def _params_key(shape_kwargs: Mapping[str, Any], render_settings: Any) -> str:
+    """Hash the shape parameters plus everything the STL/PNG renders read."""
+    h = hashlib.blake2b(_MODULE_DIGEST, digest_size=16)
+    h.update(getattr(ad, "__version__", "").encode("utf-8"))
+    h.update(json.dumps([shape_kwargs, render_settings], sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _write_scad(shape: SolarBusAssembly, scad_path: Path, params_key: str | None) -> bool:
+    """Write the SCAD unless the sidecar key shows it is already current.
+
+    Without a ``params_key`` (``scad: false``) the SCAD is an intermediate file:
+    it is always rendered and no sidecar is kept. Returns True when the
+    existing file was reused.
+    """
+    key_path = scad_path.with_suffix(".cachekey")
+    try:
+        if params_key and scad_path.is_file() and key_path.read_text(encoding="utf-8") == params_key:
+            return True
+    except OSError:
+        pass
+    key_path.unlink(missing_ok=True)
+    render_result = render_shape(shape)
+    with scad_path.open("w", encoding="utf-8") as handle:
+        render_result.rendered_shape.dump(handle)
+    if params_key:
+        key_path.write_text(params_key, encoding="utf-8")
+    return False
+
+
+def _output_current(output_path: Path, scad_path: Path) -> bool:
+    """True when ``output_path`` was rendered after the reused SCAD's sidecar."""
+    try:
+        key_mtime = scad_path.with_suffix(".cachekey").stat().st_mtime_ns
+        return output_path.stat().st_mtime_ns > key_mtime
+    except OSError:
+        return False
+
+
 def build(context: BuildContext) -> EngineResult:
     shape_kwargs = _shape_kwargs(context)
     shape = SolarBusAssembly(**shape_kwargs)
-    render_result = render_shape(shape)
 
     png_enabled, png_args = build_png_args(context.export.get("png"))
+    render_cache = RenderCache.from_config(context.export.get("render_cache"))
     scad_required = context.export.get("scad", True)
     scad_path = context.out_dir / f"{context.basename}.scad"
+    stl_args = openscad_backend_args(context.export, context.openscad_bin)
     scad_written = False
+    scad_reused = False
     if scad_required or context.export.get("stl") or png_enabled:
-        with scad_path.open("w", encoding="utf-8") as handle:
-            render_result.rendered_shape.dump(handle)
+        params_key = None
+        if scad_required:
+            params_key = _params_key(
+                shape_kwargs,
+                [
+                    context.openscad_bin,
+                    stl_args,
+                    png_args,
+                    bool(context.export.get("png_fast_preview")),
+                ],
+            )
+        scad_reused = _write_scad(shape, scad_path, params_key)
         scad_written = True
 
     stl_paths = []
     step_paths = []
+    stl_reused = False
     if context.export.get("stl"):
         stl_path = context.out_dir / f"{context.basename}.stl"
-        run_openscad(scad_path, stl_path, context.openscad_bin)
+        # Outputs rendered after the sidecar of a reused SCAD are current.
+        stl_reused = scad_reused and _output_current(stl_path, scad_path)
+        if not stl_reused:
+            run_openscad(
+                scad_path,
+                stl_path,
+                context.openscad_bin,
+                stl_args,
+                cache=render_cache,
+            )
         stl_paths.append(stl_path)
 
     logs: list[str] = []
-    if scad_written:
+    if scad_reused:
+        logs.append(f"SCAD unchanged, reused {scad_path}")
+    elif scad_written:
         logs.append(f"SCAD written to {scad_path}")
-    if stl_paths:
+    if stl_reused:
+        logs.append(f"STL unchanged, reused {stl_paths[-1]}")
+    elif stl_paths:
         logs.append(f"STL written to {stl_paths[-1]}")
     if context.export.get("step"):
         step_path = context.out_dir / f"{context.basename}.step"
@@ -372,14 +451,22 @@ def build(context: BuildContext) -> EngineResult:
     png_paths = []
     if png_enabled:
         png_path = context.out_dir / f"{context.basename}.png"
-        try:
-            run_openscad(scad_path, png_path, context.openscad_bin, png_args)
-        except ExportError as exc:
-            preview_rects = _solar_preview_rects_from_shape(shape)
-            render_rect_preview(preview_rects, png_path)
-            logs.append(f"PNG fallback rendered to {png_path} ({exc})")
+        if scad_reused and _output_current(png_path, scad_path):
+            logs.append(f"PNG unchanged, reused {png_path}")
+        elif context.export.get("png_fast_preview"):
+            render_rect_preview(_solar_preview_rects_from_shape(shape), png_path)
+            logs.append(f"PNG preview rendered to {png_path}")
         else:
-            logs.append(f"PNG written to {png_path}")
+            try:
+                run_openscad(scad_path, png_path, context.openscad_bin, png_args, cache=render_cache)
+            except ExportError as exc:
+                preview_rects = _solar_preview_rects_from_shape(shape)
+                render_rect_preview(preview_rects, png_path)
+                # Retry the real render next time instead of reusing the fallback.
+                scad_path.with_suffix(".cachekey").unlink(missing_ok=True)
+                logs.append(f"PNG fallback rendered to {png_path} ({exc})")
+            else:
+                logs.append(f"PNG written to {png_path}")
         png_paths.append(png_path)
 
     meta = {
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import math
+from bisect import bisect_left
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 import struct
 import zlib
@@ -19,6 +21,9 @@ class RectSpec:
 
 @dataclass
 class RectPrismSpec:
+    # Slotted: preview builders create these by the thousand.
+    __slots__ = ("x0", "y0", "z0", "x1", "y1", "z1", "color")
+
     x0: float
     y0: float
     z0: float
@@ -58,31 +63,45 @@ def render_rect_preview(
     scale_x = (width - 1) / span_x
     scale_y = (height - 1) / span_y
 
-    pixels = bytearray(width * height * 3)
-    bg_r, bg_g, bg_b = background
-    for i in range(0, len(pixels), 3):
-        pixels[i : i + 3] = bytes((bg_r, bg_g, bg_b))
-
-    def clamp(val: int, low: int, high: int) -> int:
-        return max(low, min(high, val))
+    # Paint with whole-buffer / whole-row slice assignments rather than
+    # per-pixel loops; each one is a single C-level copy.
+    row_stride = width * 3
+    max_px = width - 1
+    max_py = height - 1
 
+    # Map every rect to clamped, ordered pixel bounds up front; round() on a
+    # float already returns an int, so no extra int() conversion is needed.
+    boxes: list[tuple[int, int, int, int, tuple[int, int, int]]] = []
     for rect in rects:
-        px0 = clamp(int(round((rect.x0 - min_x) * scale_x)), 0, width - 1)
-        px1 = clamp(int(round((rect.x1 - min_x) * scale_x)), 0, width - 1)
+        px0 = max(0, min(max_px, round((rect.x0 - min_x) * scale_x)))
+        px1 = max(0, min(max_px, round((rect.x1 - min_x) * scale_x)))
+        py_top = max(0, min(max_py, round((max_y - rect.y1) * scale_y)))
+        py_bottom = max(0, min(max_py, round((max_y - rect.y0) * scale_y)))
         if px1 < px0:
             px0, px1 = px1, px0
-
-        py_top = clamp(int(round((max_y - rect.y1) * scale_y)), 0, height - 1)
-        py_bottom = clamp(int(round((max_y - rect.y0) * scale_y)), 0, height - 1)
         if py_bottom < py_top:
             py_top, py_bottom = py_bottom, py_top
+        boxes.append((px0, px1, py_top, py_bottom, rect.color))
+
+    # The first rect (the roof / footprint) is usually the largest: fold it
+    # into the background fill as repeated row templates instead of painting
+    # it over an already-filled canvas.
+    px0, px1, py_top, py_bottom, color = boxes[0]
+    bg = bytes(background)
+    bg_row = bg * width
+    first_row = bg * px0 + bytes(color) * (px1 - px0 + 1) + bg * (max_px - px1)
+    pixels = bytearray(
+        bg_row * py_top
+        + first_row * (py_bottom - py_top + 1)
+        + bg_row * (max_py - py_bottom)
+    )
 
-        color = bytes(rect.color)
-        for py in range(py_top, py_bottom + 1):
-            base = py * width * 3
-            for px in range(px0, px1 + 1):
-                idx = base + px * 3
-                pixels[idx : idx + 3] = color
+    for px0, px1, py_top, py_bottom, color in boxes[1:]:
+        span = bytes(color) * (px1 - px0 + 1)
+        start = py_top * row_stride + px0 * 3
+        for _ in range(py_top, py_bottom + 1):
+            pixels[start : start + len(span)] = span
+            start += row_stride
 
     _write_png(path, width, height, pixels)
 
@@ -98,48 +117,38 @@ def render_isometric_preview(
             RectPrismSpec(-50, -50, 0, 50, 50, 100, (150, 150, 150)),
         ]
 
-    def iso_project(x: float, y: float, z: float) -> tuple[float, float]:
-        u = (x - y) * 0.5
-        v = (x + y) * 0.25 - z
-        return u, v
-
+    # Isometric projection: u = (x - y) / 2, v = (x + y) / 4 - z. Each prism
+    # shows three faces built from seven distinct corners, projected once.
     polygons: list[tuple[list[tuple[float, float]], tuple[int, int, int]]] = []
-    min_u = float("inf")
-    max_u = float("-inf")
-    min_v = float("inf")
-    max_v = float("-inf")
-
-    def add_poly(points, color):
-        nonlocal min_u, max_u, min_v, max_v
-        polygons.append((points, color))
-        for u, v in points:
-            min_u = min(min_u, u)
-            max_u = max(max_u, u)
-            min_v = min(min_v, v)
-            max_v = max(max_v, v)
-
     for prism in prisms:
-        top = [
-            iso_project(prism.x0, prism.y0, prism.z1),
-            iso_project(prism.x1, prism.y0, prism.z1),
-            iso_project(prism.x1, prism.y1, prism.z1),
-            iso_project(prism.x0, prism.y1, prism.z1),
-        ]
-        side_y = [
-            iso_project(prism.x1, prism.y0, prism.z0),
-            iso_project(prism.x1, prism.y0, prism.z1),
-            iso_project(prism.x1, prism.y1, prism.z1),
-            iso_project(prism.x1, prism.y1, prism.z0),
-        ]
-        side_x = [
-            iso_project(prism.x0, prism.y1, prism.z0),
-            iso_project(prism.x0, prism.y1, prism.z1),
-            iso_project(prism.x1, prism.y1, prism.z1),
-            iso_project(prism.x1, prism.y1, prism.z0),
-        ]
-        add_poly(side_y, _adjust_color(prism.color, 0.7))
-        add_poly(side_x, _adjust_color(prism.color, 0.85))
-        add_poly(top, prism.color)
+        x0, y0, z0 = prism.x0, prism.y0, prism.z0
+        x1, y1, z1 = prism.x1, prism.y1, prism.z1
+        u_x0y0 = (x0 - y0) * 0.5
+        u_x1y0 = (x1 - y0) * 0.5
+        u_x1y1 = (x1 - y1) * 0.5
+        u_x0y1 = (x0 - y1) * 0.5
+        s_x0y0 = (x0 + y0) * 0.25
+        s_x1y0 = (x1 + y0) * 0.25
+        s_x1y1 = (x1 + y1) * 0.25
+        s_x0y1 = (x0 + y1) * 0.25
+        x1y0_top = (u_x1y0, s_x1y0 - z1)
+        x1y1_top = (u_x1y1, s_x1y1 - z1)
+        x0y1_top = (u_x0y1, s_x0y1 - z1)
+        x1y1_bottom = (u_x1y1, s_x1y1 - z0)
+        top = [(u_x0y0, s_x0y0 - z1), x1y0_top, x1y1_top, x0y1_top]
+        side_y = [(u_x1y0, s_x1y0 - z0), x1y0_top, x1y1_top, x1y1_bottom]
+        side_x = [(u_x0y1, s_x0y1 - z0), x0y1_top, x1y1_top, x1y1_bottom]
+        color = tuple(prism.color)
+        polygons.append((side_y, _adjust_color(color, 0.7)))
+        polygons.append((side_x, _adjust_color(color, 0.85)))
+        polygons.append((top, color))
+
+    us = [u for points, _ in polygons for u, _ in points]
+    vs = [v for points, _ in polygons for _, v in points]
+    min_u = min(us)
+    max_u = max(us)
+    min_v = min(vs)
+    max_v = max(vs)
 
     width, height = size
     span_u = max(max_u - min_u, 1e-3)
@@ -159,33 +168,35 @@ def render_isometric_preview(
         ([to_pixel(u, v) for u, v in poly], color) for poly, color in polygons
     ]
 
-    pixels = bytearray(width * height * 3)
-    bg_r, bg_g, bg_b = background
-    for i in range(0, len(pixels), 3):
-        pixels[i : i + 3] = bytes((bg_r, bg_g, bg_b))
+    pixels = bytearray(bytes(background) * (width * height))
 
-    for pts, color in pixel_polys:
-        _fill_polygon(pixels, width, height, pts, color)
+    # Painter's algorithm run front to back: every pixel keeps the first
+    # (i.e. topmost) face that claims it, so the output matches back-to-front
+    # overdraw while hidden faces and hidden parts of faces are never painted.
+    covered: list[tuple[list[int], list[int]]] = [([], []) for _ in range(height)]
+    for pts, color in reversed(pixel_polys):
+        _fill_polygon(pixels, width, height, pts, color, covered)
 
     _write_png(path, width, height, pixels)
 
 
+_pack_u32 = struct.Struct(">I").pack
+
+
 def _write_png(path: Path, width: int, height: int, pixels: bytes) -> None:
     def chunk(tag: bytes, data: bytes) -> bytes:
-        return (
-            struct.pack(">I", len(data))
-            + tag
-            + data
-            + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
-        )
+        # CRC the tag and payload separately; tag + data would copy the IDAT.
+        crc = zlib.crc32(data, zlib.crc32(tag))
+        return b"".join((_pack_u32(len(data)), tag, data, _pack_u32(crc & 0xFFFFFFFF)))
 
-    raw = bytearray()
+    # Each scanline gets a leading filter byte 0 (None); one join inserts
+    # them all instead of appending row by row.
     row_bytes = width * 3
-    for y in range(height):
-        raw.append(0)
-        start = y * row_bytes
-        raw.extend(pixels[start : start + row_bytes])
-    compressed = zlib.compress(bytes(raw), level=9)
+    view = memoryview(pixels)
+    rows = [view[start : start + row_bytes] for start in range(0, height * row_bytes, row_bytes)]
+    raw = b"\x00" + b"\x00".join(rows) if rows else b""
+    # Flat-colour previews: level 6 is ~1.7x faster than 9 for a few KB more.
+    compressed = zlib.compress(raw, level=6)
 
     ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
 
@@ -196,7 +207,23 @@ def _write_png(path: Path, width: int, height: int, pixels: bytes) -> None:
         fh.write(chunk(b"IEND", b""))
 
 
-def _fill_polygon(pixels: bytearray, width: int, height: int, pts, color):
+def _fill_polygon(
+    pixels: bytearray,
+    width: int,
+    height: int,
+    pts,
+    color,
+    covered: list[tuple[list[int], list[int]]] | None = None,
+):
+    """Even-odd fill sampled at pixel centres, one span per scanline run.
+
+    A pixel centre ``x`` is inside when an odd number of the row's edge
+    crossings lie to its right, i.e. between crossings 1-2, 3-4, ... of the
+    sorted list; each such run is painted with one slice assignment.
+
+    With ``covered`` (per-row painted runs), pixels already painted are left
+    alone and the new runs are recorded, for front-to-back drawing.
+    """
     if len(pts) < 3:
         return
     xs = [p[0] for p in pts]
@@ -205,28 +232,82 @@ def _fill_polygon(pixels: bytearray, width: int, height: int, pts, color):
     max_x = min(int(math.ceil(max(xs))), width - 1)
     min_y = max(int(math.floor(min(ys))), 0)
     max_y = min(int(math.ceil(max(ys))), height - 1)
+    if min_x > max_x:
+        return
     col = bytes(color)
+    edges = [(pts[i - 1][0], pts[i - 1][1], pts[i][0], pts[i][1]) for i in range(len(pts))]
     for py in range(min_y, max_y + 1):
-        for px in range(min_x, max_x + 1):
-            if _point_in_poly(px + 0.5, py + 0.5, pts):
-                idx = (py * width + px) * 3
-                pixels[idx : idx + 3] = col
-
-
-def _point_in_poly(x: float, y: float, pts) -> bool:
-    inside = False
-    n = len(pts)
-    j = n - 1
-    for i in range(n):
-        xi, yi = pts[i]
-        xj, yj = pts[j]
-        if ((yi > y) != (yj > y)) and (
-            x < (xj - xi) * (y - yi) / ((yj - yi) or 1e-9) + xi
-        ):
-            inside = not inside
-        j = i
-    return inside
-
-
+        y = py + 0.5
+        crossings = sorted(
+            (xj - xi) * (y - yi) / ((yj - yi) or 1e-9) + xi
+            for xj, yj, xi, yi in edges
+            if (yi > y) != (yj > y)
+        )
+        row = py * width * 3
+        for k in range(0, len(crossings) - 1, 2):
+            first = max(_first_centre_at_or_after(crossings[k]), min_x)
+            last = min(_last_centre_before(crossings[k + 1]), max_x)
+            if first > last:
+                continue
+            if covered is None:
+                pixels[row + first * 3 : row + (last + 1) * 3] = col * (last - first + 1)
+            else:
+                _paint_uncovered(pixels, row, first, last, col, covered[py])
+
+
+def _paint_uncovered(
+    pixels: bytearray,
+    row: int,
+    first: int,
+    last: int,
+    col: bytes,
+    runs: tuple[list[int], list[int]],
+) -> None:
+    """Paint the gaps of ``first..last`` not in ``runs``, then merge it in.
+
+    ``runs`` holds the row's painted pixels as sorted, disjoint, non-touching
+    inclusive ``(starts, ends)``.
+    """
+    starts, ends = runs
+    i = bisect_left(ends, first - 1)
+    j = i
+    cursor = first
+    lo = first
+    hi = last
+    while j < len(starts) and starts[j] <= last + 1:
+        start = starts[j]
+        if start > cursor:
+            pixels[row + cursor * 3 : row + start * 3] = col * (start - cursor)
+        cursor = max(cursor, ends[j] + 1)
+        lo = min(lo, start)
+        hi = max(hi, ends[j])
+        j += 1
+    if cursor <= last:
+        pixels[row + cursor * 3 : row + (last + 1) * 3] = col * (last + 1 - cursor)
+    starts[i:j] = [lo]
+    ends[i:j] = [hi]
+
+
+def _first_centre_at_or_after(x: float) -> int:
+    """Smallest ``px`` with ``px + 0.5 >= x`` (exact, despite float rounding)."""
+    px = math.ceil(x - 0.5)
+    if px + 0.5 < x:
+        px += 1
+    elif px - 0.5 >= x:
+        px -= 1
+    return px
+
+
+def _last_centre_before(x: float) -> int:
+    """Largest ``px`` with ``px + 0.5 < x`` (exact, despite float rounding)."""
+    px = math.ceil(x - 0.5) - 1
+    if px + 1.5 < x:
+        px += 1
+    elif px + 0.5 >= x:
+        px -= 1
+    return px
+
+
+@lru_cache(maxsize=512)
 def _adjust_color(color: tuple[int, int, int], factor: float) -> tuple[int, int, int]:
     return tuple(max(0, min(255, int(c * factor))) for c in color)
@@ -1,16 +1,35 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, fields
+from functools import lru_cache
+import hashlib
+import os
 from pathlib import Path
-from typing import Any, Mapping, Sequence
+import shutil
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
 import textwrap
 
 from ...core.engine import BuildContext, EngineResult
-from ...core.export import ExportError, build_png_args, export_step_artifact, run_openscad
+from ...core.export import (
+    ExportError,
+    RenderCache,
+    build_png_args,
+    export_step_artifact,
+    openscad_workers as _png_workers,
+    run_openscad,
+    scad_dependency_stamp,
+    usable_cpus,
+)
 
 REPO_ROOT = next(p for p in Path(__file__).resolve().parents if p.name == "oscadforge").parent
 # Prefer user-provided SCAD under in/openGrid-beam
 BEAM_SCAD_PATH = REPO_ROOT / "in" / "openGrid-beam" / "openGrid-beam.scad"
+# Resolved once; every generated beam SCAD references the same files.
+BEAM_SCAD_RESOLVED = BEAM_SCAD_PATH.resolve()
+BOSL2_STD_PATH = (REPO_ROOT / "third_party" / "BOSL2" / "std.scad").resolve()
+OPENGRID_SCAD_PATH = (REPO_ROOT / "third_party" / "QuackWorks" / "openGrid" / "openGrid.scad").resolve()
+JL_SCAD_DIR = (REPO_ROOT / "third_party" / "jl_scad").resolve()
 
 
 def _bool(value: bool) -> str:
@@ -111,8 +130,20 @@ class BeamJointParams:
             raise ValueError("board_width and board_height must be >= 1")
 
 
+_PARAM_NAMES = tuple(f.name for f in fields(BeamJointParams))
+
+
 def _render_scad(params: BeamJointParams, *, call_scene: bool = True, include_prelude: bool = True) -> str:
-    include_path = BEAM_SCAD_PATH.resolve()
+    # Grid panels share a handful of edge-flag combinations, so the text is
+    # memoized on the field values (the dataclass itself is mutable).
+    values = tuple(getattr(params, name) for name in _PARAM_NAMES)
+    return _render_scad_cached(values, call_scene, include_prelude)
+
+
+@lru_cache(maxsize=256)
+def _render_scad_cached(values: tuple, call_scene: bool, include_prelude: bool) -> str:
+    params = BeamJointParams(*values)
+    include_path = BEAM_SCAD_RESOLVED
     prelude = f"// Generated by oscadforge openGrid-beam model\ninclude <{include_path}>;\n\n" if include_prelude else "// Generated by oscadforge openGrid-beam model\n\n"
     # Include the SCAD and override the globals that steer the generator.
     body = textwrap.dedent(
@@ -217,6 +248,111 @@ def _render_scad(params: BeamJointParams, *, call_scene: bool = True, include_pr
     return body + "\n"
 
 
+def geometry_key(*parts: str | bytes) -> str:
+    """Digest used to spot SCAD files that render to the same image."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode("utf-8") if isinstance(part, str) else part)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=256)
+def _encoded(text: str) -> bytes:
+    """UTF-8 bytes of a shared SCAD fragment (preludes, memoized bodies)."""
+    return text.encode("utf-8")
+
+
+def _write_chunks(path: Path, chunks: Sequence[bytes]) -> None:
+    """Write ``chunks`` to ``path`` with one gathered write where supported."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        written = os.writev(fd, chunks) if hasattr(os, "writev") else 0
+        if written < sum(len(chunk) for chunk in chunks):
+            rest = memoryview(b"".join(chunks))[written:]
+            while rest:
+                rest = rest[os.write(fd, rest) :]
+    finally:
+        os.close(fd)
+
+
+def _workers() -> int:
+    """SCAD-writing threads: OSCADFORGE_WORKERS, else the usable CPU count."""
+    return max(1, int(os.getenv("OSCADFORGE_WORKERS") or usable_cpus()))
+
+
+def _beam_source_stamp() -> str:
+    """Identify the SCAD libraries beam files include: the user-provided beam
+    SCAD, BOSL2, openGrid and (for Papierkorb panels) jl_scad."""
+    return scad_dependency_stamp(
+        [
+            BEAM_SCAD_RESOLVED,
+            BOSL2_STD_PATH,
+            OPENGRID_SCAD_PATH,
+            JL_SCAD_DIR / "box.scad",
+            JL_SCAD_DIR / "parts.scad",
+        ]
+    )
+
+
+def _png_is_current(png_path: Path, stamp: str) -> bool:
+    try:
+        return png_path.is_file() and _stamp_path(png_path).read_text(encoding="utf-8") == stamp
+    except OSError:
+        return False
+
+
+def _stamp_path(png_path: Path) -> Path:
+    return png_path.with_name(f"{png_path.name}.hash")
+
+
+def _render_pngs(
+    jobs: Sequence[Tuple[str, Path, Path, Sequence[str]]],
+    openscad_bin: str | None,
+    max_workers: int,
+    cache: RenderCache | None = None,
+) -> Dict[Path, Exception | None]:
+    """Render ``(key, scad_path, png_path, args)`` jobs, once per distinct key.
+
+    Panels with identical edge flags produce identical geometry, so only the
+    first SCAD of each group goes through OpenSCAD and the resulting PNG is
+    copied to the others. Each PNG gets a ``<name>.png.hash`` sidecar; when it
+    still matches the key, the render is skipped. With an enabled ``cache``
+    unchanged SCAD is also restored from other output directories. Returns the
+    error (or None) for every PNG path.
+    """
+    groups: Dict[Tuple[str, Tuple[str, ...]], List[Tuple[Path, Path]]] = {}
+    for key, scad_path, png_path, args in jobs:
+        groups.setdefault((key, tuple(args)), []).append((scad_path, png_path))
+    source_stamp = _beam_source_stamp()
+
+    def render(item) -> Dict[Path, Exception | None]:
+        (key, args), group = item
+        stamp = geometry_key(key, openscad_bin or "", source_stamp, *args)
+        stale = [png for _, png in group if not _png_is_current(png, stamp)]
+        if not stale:
+            return {png: None for _, png in group}
+        (scad_path, png_path), *_ = group
+        try:
+            for png in stale:
+                _stamp_path(png).unlink(missing_ok=True)
+            if png_path in stale:
+                run_openscad(scad_path, png_path, openscad_bin, list(args), cache=cache)
+            for png in stale:
+                if png != png_path:
+                    shutil.copyfile(png_path, png)
+                _stamp_path(png).write_text(stamp, encoding="utf-8")
+        except Exception as exc:
+            return {png: exc for _, png in group}
+        return {png: None for _, png in group}
+
+    results: Dict[Path, Exception | None] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(groups) or 1))) as ex:
+        for outcome in ex.map(render, groups.items()):
+            results.update(outcome)
+    return results
+
+
 def _png_args_from_cfg(cfg: Mapping[str, Any] | bool | None) -> tuple[bool, Sequence[str]]:
     enabled, base_args = build_png_args(cfg)
     return enabled, base_args
@@ -1,64 +1,83 @@
 from __future__ import annotations
 
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import replace
-import os
+import copy
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Sequence, Tuple
 
 from ...core.engine import BuildContext, EngineResult
-from ...core.export import ExportError, build_png_args, run_openscad
+from ...core.export import ExportError, RenderCache, build_png_args
 from ..papierkorb.params import PapierkorbParams
 from ..papierkorb.panels import Panel, PanelGrid, PanelKind, build_panels
-from . import BeamJointParams, _render_scad
+from . import (
+    BOSL2_STD_PATH,
+    OPENGRID_SCAD_PATH,
+    BeamJointParams,
+    _encoded,
+    _png_workers,
+    _render_pngs,
+    _render_scad,
+    _workers,
+    _write_chunks,
+    geometry_key,
+)
 
 REPO_ROOT = next(p for p in Path(__file__).resolve().parents if p.name == "oscadforge").parent
+# Identical for every panel; encoded once and written as the first chunk.
+_PRELUDE = (
+    f'include <{BOSL2_STD_PATH.as_posix()}>;\n'
+    f'use <{OPENGRID_SCAD_PATH.as_posix()}>;\n'
+    f'$tags_shown = \"ALL\";\n'
+    f'$tags_hidden = [];\n'
+    f'$tags = [];\n'
+    f'$tag = \"\";\n'
+    '\n'
+).encode("utf-8")
 
 
 def _cells(value: float, tile: float) -> int:
     return max(1, round(value / tile))
 
 
-def _edge_flags(panel: Panel, grid: PanelGrid) -> Tuple[bool, bool, bool, bool]:
-    Nx, Ny, Nz = grid.Nx, grid.Ny, grid.Nz
-
-    if panel.kind is PanelKind.FLOOR:
-        ix, iy, _ = panel.indices
-        bottom = iy == 0
-        top = iy == Ny - 1
-        left = ix == 0
-        right = ix == Nx - 1
-    elif panel.kind in (PanelKind.WALL_POS_Y, PanelKind.WALL_NEG_Y):
-        ix, _, iz = panel.indices
-        bottom = iz == 0
-        top = iz == Nz - 1
-        left = ix == 0
-        right = ix == Nx - 1
-    elif panel.kind in (PanelKind.WALL_POS_X, PanelKind.WALL_NEG_X):
-        _, iy, iz = panel.indices
-        bottom = iz == 0
-        top = iz == Nz - 1
-        left = iy == 0
-        right = iy == Ny - 1
-    else:
-        bottom = top = left = right = False
-    return bottom, right, left, top
-
-
-def _beam_params_for_panel(panel, params: BeamJointParams, grid: PanelGrid) -> BeamJointParams:
-    tile = params.tile_size_mm
-    bw = _cells(panel.width, tile)
-    bh = _cells(panel.height, tile)
-    bottom, right, left, top = _edge_flags(panel, grid)
+# Which panel indices run along a panel's local (u, v) axes, per kind.
+_EDGE_AXES: Dict[PanelKind, Tuple[int, int]] = {
+    PanelKind.FLOOR: (0, 1),
+    PanelKind.WALL_POS_Y: (0, 2),
+    PanelKind.WALL_NEG_Y: (0, 2),
+    PanelKind.WALL_POS_X: (1, 2),
+    PanelKind.WALL_NEG_X: (1, 2),
+}
+EdgeFlags = Tuple[bool, bool, bool, bool]
+
+
+def _edge_flag_table(panels: Sequence[Panel], grid: PanelGrid) -> Dict[str, EdgeFlags]:
+    """Map panel_id -> (bottom, right, left, top) outer-edge flags, in one pass."""
+    counts = (grid.Nx, grid.Ny, grid.Nz)
+    table: Dict[str, EdgeFlags] = {}
+    for panel in panels:
+        axes = _EDGE_AXES.get(panel.kind)
+        if axes is None:
+            table[panel.panel_id] = (False, False, False, False)
+            continue
+        u_axis, v_axis = axes
+        iu = panel.indices[u_axis]
+        iv = panel.indices[v_axis]
+        table[panel.panel_id] = (iv == 0, iu == counts[u_axis] - 1, iu == 0, iv == counts[v_axis] - 1)
+    return table
+
+
+_WALL_KINDS = (PanelKind.WALL_POS_Y, PanelKind.WALL_NEG_Y, PanelKind.WALL_POS_X, PanelKind.WALL_NEG_X)
+
+
+@lru_cache(maxsize=64)
+def _edge_overrides(
+    bottom: bool, right: bool, left: bool, top: bool, layer_bottom: bool, layer_top: bool
+) -> Dict[str, bool]:
+    """Beam/connector/joint/chamfer flags for one edge combination (treat as read-only)."""
     # Edge-aware flags: only outer edges get beams/joints/connectors
     board_conn = bottom or right or left or top
 
-    layer_bottom = panel.kind is PanelKind.FLOOR
-    layer_top = (
-        panel.kind in (PanelKind.WALL_POS_Y, PanelKind.WALL_NEG_Y, PanelKind.WALL_POS_X, PanelKind.WALL_NEG_X)
-        and panel.indices[2] == grid.Nz - 1
-    )
-
     chamfer_edge = layer_top  # chamfer only the top rim
 
     # Corner joints: only the four bottom corners of the floor
@@ -67,10 +86,7 @@ def _beam_params_for_panel(panel, params: BeamJointParams, grid: PanelGrid) -> B
     corner_tl = top and left and layer_bottom
     corner_tr = top and right and layer_bottom
 
-    return replace(
-        params,
-        board_width=bw,
-        board_height=bh,
+    return dict(
         beam_bottom=bottom,
         beam_top=top,
         beam_left=left,
@@ -113,6 +129,20 @@ def _beam_params_for_panel(panel, params: BeamJointParams, grid: PanelGrid) -> B
         chamfer_right_r=chamfer_edge and right,
     )
 
+
+def _beam_params_for_panel(panel, params: BeamJointParams, grid: PanelGrid, edges: EdgeFlags) -> BeamJointParams:
+    tile = params.tile_size_mm
+    layer_bottom = panel.kind is PanelKind.FLOOR
+    layer_top = panel.kind in _WALL_KINDS and panel.indices[2] == grid.Nz - 1
+
+    # A shallow copy plus one dict update; dataclasses.replace would re-run
+    # __init__ through per-field reflection for every panel.
+    beam_params = copy.copy(params)
+    beam_params.__dict__.update(_edge_overrides(*edges, layer_bottom, layer_top))
+    beam_params.board_width = _cells(panel.width, tile)
+    beam_params.board_height = _cells(panel.height, tile)
+    return beam_params
+
 def _z_overhang(panel: Panel, params: BeamJointParams, grid: PanelGrid) -> float:
     """Return extra height above tile_thickness contributed by beams/joints/chamfer."""
     variant = params.board_variant.lower()
@@ -144,33 +174,18 @@ def _z_overhang(panel: Panel, params: BeamJointParams, grid: PanelGrid) -> float
     return 5.1
 
 
-def _write_panel_beam(panel, params: BeamJointParams, grid: PanelGrid, out_dir: Path, openscad_bin: str | None, png_cfg) -> Tuple[Path, Path | None]:
-    panel_params = _beam_params_for_panel(panel, params, grid)
+def _write_panel_beam(
+    panel, params: BeamJointParams, grid: PanelGrid, out_dir: Path, edges: EdgeFlags
+) -> Tuple[Path, str]:
+    """Write the beam SCAD for ``panel``; return its path and geometry key."""
+    panel_params = _beam_params_for_panel(panel, params, grid, edges)
     z_shift = _z_overhang(panel, panel_params, grid)
-    bosl = (REPO_ROOT / "third_party" / "BOSL2" / "std.scad").resolve()
-    og = (REPO_ROOT / "third_party" / "QuackWorks" / "openGrid" / "openGrid.scad").resolve()
-    prelude = (
-        f'include <{bosl.as_posix()}>;\n'
-        f'use <{og.as_posix()}>;\n'
-        f'$tags_shown = \"ALL\";\n'
-        f'$tags_hidden = [];\n'
-        f'$tags = [];\n'
-        f'$tag = \"\";\n'
-    )
-    scad_body = _render_scad(panel_params, call_scene=False)
-    scad_text = f"{prelude}\n{scad_body}\ntranslate([0,0,-{z_shift}]) scene(Board_Width=Board_Width, Board_Height=Board_Height);\n"
+    scad_body = _encoded(_render_scad(panel_params, call_scene=False))
+    tail = f"\ntranslate([0,0,-{z_shift}]) scene(Board_Width=Board_Width, Board_Height=Board_Height);\n".encode("utf-8")
+    chunks = [_PRELUDE, scad_body, tail]
     scad_path = out_dir / f"{panel.panel_id}_beam.scad"
-    scad_path.write_text(scad_text, encoding="utf-8")
-
-    png_enabled, png_args = build_png_args(png_cfg)
-    png_path: Path | None = None
-    if png_enabled:
-        png_path = out_dir / f"{panel.panel_id}_beam.png"
-        try:
-            run_openscad(scad_path, png_path, openscad_bin, png_args)
-        except ExportError:
-            png_path = None
-    return scad_path, png_path
+    _write_chunks(scad_path, chunks)
+    return scad_path, geometry_key(*chunks)
 
 
 def build(context: BuildContext) -> EngineResult:
@@ -192,34 +207,45 @@ def build(context: BuildContext) -> EngineResult:
     png_paths: List[Path] = []
     logs: List[str] = []
 
-    max_workers = max(1, int(os.getenv("OSCADFORGE_WORKERS", os.cpu_count() or 4)))
+    max_workers = _workers()
 
     panels = panel_result.panels
+    edge_table = _edge_flag_table(panels, grid)
 
     def _task(panel):
-        scad_path, png_path = _write_panel_beam(
+        scad_path, key = _write_panel_beam(
             panel=panel,
             params=base,
             grid=grid,
             out_dir=out_dir,
-            openscad_bin=context.openscad_bin,
-            png_cfg=context.export.get("png"),
+            edges=edge_table[panel.panel_id],
         )
-        return panel.panel_id, scad_path, png_path
+        return panel.panel_id, scad_path, key
 
+    png_jobs = []
+    png_enabled, png_args = build_png_args(context.export.get("png"))
     with ThreadPoolExecutor(max_workers=max_workers) as ex:
         futures = {ex.submit(_task, panel): panel for panel in panels}
         for fut in as_completed(futures):
             panel = futures[fut]
             try:
-                panel_id, scad_path, png_path = fut.result()
+                panel_id, scad_path, key = fut.result()
             except Exception as exc:  # surface first failure
                 raise RuntimeError(f"beam build failed for panel {panel.panel_id}") from exc
             scad_paths.append(scad_path)
             logs.append(f"SCAD written to {scad_path}")
-            if png_path:
-                png_paths.append(png_path)
-                logs.append(f"PNG written to {png_path}")
+            if png_enabled:
+                png_jobs.append((key, scad_path, out_dir / f"{panel_id}_beam.png", png_args))
+
+    # Render after all SCAD is on disk; identical beams share one OpenSCAD run.
+    render_cache = RenderCache.from_config(context.export.get("render_cache"))
+    for png_path, error in _render_pngs(png_jobs, context.openscad_bin, _png_workers(), render_cache).items():
+        if isinstance(error, ExportError):
+            continue
+        if error is not None:
+            raise RuntimeError(f"beam PNG render failed for {png_path}") from error
+        png_paths.append(png_path)
+        logs.append(f"PNG written to {png_path}")
 
     metadata: Dict[str, Any] = {
         "panel_count": len(panels),
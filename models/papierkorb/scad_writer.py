@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Iterable, List, Sequence, Tuple
 
 from .layout import PanelPlacement
@@ -49,12 +50,16 @@ def build_scad_for_panel(
     panel: Panel,
     jl_scad_path: str,
 ) -> str:
-    header = _scad_header(jl_scad_path)
-    shell_module = _shell_module(params)
+    # Header and shell are identical for every panel of a build; only the
+    # panel module (absolute bounds and feature matrices) is per-panel.
+    prefix = _panel_prefix(jl_scad_path, _shell_key(params))
     panel_module = _panel_module(panel, params)
-    return (
-        f"{header}\n\n{shell_module}\n\n{panel_module}\n\npanel_geom_{panel.panel_id}();\n"
-    )
+    return f"{prefix}{panel_module}\n\npanel_geom_{panel.panel_id}();\n"
+
+
+@lru_cache(maxsize=32)
+def _panel_prefix(jl_scad_path: str, shell_key: Tuple[float, ...]) -> str:
+    return f"{_scad_header(jl_scad_path)}\n\n{_shell_module_text(*shell_key)}\n\n"
 
 
 def _scad_header(jl_scad_path: str) -> str:
@@ -64,15 +69,26 @@ include <{jl_scad_path}/parts.scad>;
 """
 
 
-def _shell_module(params: PapierkorbParams) -> str:
+def _shell_key(params: PapierkorbParams) -> Tuple[float, ...]:
     rim_height = params.rim_height_mm if params.enable_rim else 0.0
     rim_wall = params.rim_width_mm if params.enable_rim else params.wall_mm / 2.0
+    return (params.length_mm, params.width_mm, params.height_mm, params.wall_mm, rim_height, rim_wall)
+
+
+def _shell_module(params: PapierkorbParams) -> str:
+    return _shell_module_text(*_shell_key(params))
+
+
+@lru_cache(maxsize=32)
+def _shell_module_text(
+    length_mm: float, width_mm: float, height_mm: float, wall_mm: float, rim_height: float, rim_wall: float
+) -> str:
     shell = f"""
 module papierkorb_shell_master() {{
     open_round_box(
-        size=[{params.length_mm:.4f}, {params.width_mm:.4f}, {params.height_mm:.4f}],
-        wall_side={params.wall_mm:.4f},
-        wall_bot={params.wall_mm:.4f},
+        size=[{length_mm:.4f}, {width_mm:.4f}, {height_mm:.4f}],
+        wall_side={wall_mm:.4f},
+        wall_bot={wall_mm:.4f},
         rim_height={rim_height:.4f},
         rim_wall={rim_wall:.4f},
         rim_inside=false,
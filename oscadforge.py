@@ -143,7 +143,7 @@ def main(argv: Sequence[str] | None = None) -> int:
 
 def _print_available_configs() -> None:
     print("Engine models registered in oscadforge:")
-    for name in engine.available_models():
+    for name in engine.available_models(wait=True):
         print(f"  - {name}")
 
     print("\nConfig presets under oscadforge/config/:")